@@ -1,11 +1,20 @@
 """py2app setup script for Rodin.app"""
 
+import compileall
+from pathlib import Path
+
+from py2app.build_app import py2app as _py2app
 from setuptools import setup
 
 APP = ['src/rodin/main.py']
 DATA_FILES = []
+
+# Bytecode optimization level; the bundled interpreter runs at this level too
+OPTIMIZE = 2
+
 OPTIONS = {
     'argv_emulation': False,
+    'optimize': OPTIMIZE,
     'plist': {
         'CFBundleName': 'Rodin',
         'CFBundleDisplayName': 'Rodin',
@@ -29,10 +38,30 @@ OPTIONS = {
     ],
 }
 
+
+class py2app(_py2app):
+    """py2app build that byte-compiles everything copied into the bundle.
+
+    Packages listed in 'packages' are copied as source directories; without
+    matching .pyc files every module is compiled on first launch.
+    """
+
+    def run(self):
+        super().run()
+        for app in Path(self.dist_dir).glob('*.app'):
+            compileall.compile_dir(
+                str(app / 'Contents' / 'Resources'),
+                optimize=OPTIMIZE,
+                quiet=1,
+                ddir='',
+            )
+
+
 setup(
     app=APP,
     name='Rodin',
     data_files=DATA_FILES,
     options={'py2app': OPTIONS},
+    cmdclass={'py2app': py2app},
     setup_requires=['py2app'],
 )
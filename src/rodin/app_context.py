@@ -1,30 +1,82 @@
 """App context awareness for macOS."""
 
 import sys
+import time
 from typing import Literal
 
 if sys.platform == "darwin":
     from AppKit import NSWorkspace
 
 
-def get_frontmost_app() -> str | None:
-    """Get the bundle identifier of the frontmost application.
+# The frontmost app can't change faster than the user can switch apps, so
+# lookups are cached briefly to avoid repeated AppKit round-trips.
+_FRONTMOST_TTL_SECONDS = 0.25
+_frontmost_cache: tuple[float, str | None, str | None] = (float("-inf"), None, None)
+
+AppCategory = Literal["code", "terminal", "email"]
+
+# Known apps by bundle identifier
+_APP_CATEGORIES: dict[str, AppCategory] = {
+    # Code editors
+    "com.microsoft.VSCode": "code",
+    "com.microsoft.VSCodeInsiders": "code",
+    "dev.zed.Zed": "code",
+    "com.sublimetext.4": "code",
+    "com.apple.dt.Xcode": "code",
+    "com.jetbrains.intellij": "code",
+    "com.jetbrains.pycharm": "code",
+    "com.cursor.Cursor": "code",
+    "io.windsurf.Windsurf": "code",
+    # Terminals
+    "com.apple.Terminal": "terminal",
+    "com.googlecode.iterm2": "terminal",
+    "io.warp.Warp": "terminal",
+    "co.zeit.hyper": "terminal",
+    "com.github.wez.wezterm": "terminal",
+    # Email clients
+    "com.apple.mail": "email",
+    "com.microsoft.Outlook": "email",
+    "com.readdle.smartemail-Mac": "email",
+    "com.google.Gmail": "email",
+}
+
+
+def _get_frontmost() -> tuple[str | None, str | None]:
+    """Get the bundle identifier and name of the frontmost application.
 
     Returns:
-        Bundle identifier string (e.g., 'com.apple.mail') or None if not available.
+        Tuple of (bundle_id, name); either may be None if not available.
     """
+    global _frontmost_cache
+
     if sys.platform != "darwin":
-        return None
+        return None, None
 
+    now = time.monotonic()
+    fetched_at, bundle_id, name = _frontmost_cache
+    if now - fetched_at < _FRONTMOST_TTL_SECONDS:
+        return bundle_id, name
+
+    bundle_id = name = None
     try:
-        workspace = NSWorkspace.sharedWorkspace()
-        active_app = workspace.frontmostApplication()
+        active_app = NSWorkspace.sharedWorkspace().frontmostApplication()
         if active_app:
-            return active_app.bundleIdentifier()
+            bundle_id = active_app.bundleIdentifier()
+            name = active_app.localizedName()
     except Exception:
         pass
 
-    return None
+    _frontmost_cache = (now, bundle_id, name)
+    return bundle_id, name
+
+
+def get_frontmost_app() -> str | None:
+    """Get the bundle identifier of the frontmost application.
+
+    Returns:
+        Bundle identifier string (e.g., 'com.apple.mail') or None if not available.
+    """
+    return _get_frontmost()[0]
 
 
 def get_frontmost_app_name() -> str | None:
@@ -33,18 +85,7 @@ def get_frontmost_app_name() -> str | None:
     Returns:
         Application name (e.g., 'Mail') or None if not available.
     """
-    if sys.platform != "darwin":
-        return None
-
-    try:
-        workspace = NSWorkspace.sharedWorkspace()
-        active_app = workspace.frontmostApplication()
-        if active_app:
-            return active_app.localizedName()
-    except Exception:
-        pass
-
-    return None
+    return _get_frontmost()[1]
 
 
 class AppContextManager:
@@ -82,8 +123,7 @@ class AppContextManager:
         Returns:
             Dict with app context info including bundle_id, name, and suggested preset
         """
-        bundle_id = get_frontmost_app()
-        name = get_frontmost_app_name()
+        bundle_id, name = _get_frontmost()
         preset = self.get_preset_for_app(bundle_id)
 
         return {
@@ -92,47 +132,24 @@ class AppContextManager:
             "preset": preset,
         }
 
+    def classify(self, bundle_id: str | None) -> AppCategory | None:
+        """Classify an app by bundle identifier.
+
+        Returns:
+            "code", "terminal" or "email", or None if the app is not known
+        """
+        if not bundle_id:
+            return None
+        return _APP_CATEGORIES.get(bundle_id)
+
     def is_code_editor(self, bundle_id: str | None) -> bool:
         """Check if the app is a code editor."""
-        if not bundle_id:
-            return False
-
-        code_editors = {
-            "com.microsoft.VSCode",
-            "com.microsoft.VSCodeInsiders",
-            "dev.zed.Zed",
-            "com.sublimetext.4",
-            "com.apple.dt.Xcode",
-            "com.jetbrains.intellij",
-            "com.jetbrains.pycharm",
-            "com.cursor.Cursor",
-            "io.windsurf.Windsurf",
-        }
-        return bundle_id in code_editors
+        return self.classify(bundle_id) == "code"
 
     def is_terminal(self, bundle_id: str | None) -> bool:
         """Check if the app is a terminal."""
-        if not bundle_id:
-            return False
-
-        terminals = {
-            "com.apple.Terminal",
-            "com.googlecode.iterm2",
-            "io.warp.Warp",
-            "co.zeit.hyper",
-            "com.github.wez.wezterm",
-        }
-        return bundle_id in terminals
+        return self.classify(bundle_id) == "terminal"
 
     def is_email_client(self, bundle_id: str | None) -> bool:
         """Check if the app is an email client."""
-        if not bundle_id:
-            return False
-
-        email_clients = {
-            "com.apple.mail",
-            "com.microsoft.Outlook",
-            "com.readdle.smartemail-Mac",
-            "com.google.Gmail",
-        }
-        return bundle_id in email_clients
+        return self.classify(bundle_id) == "email"
@@ -1,16 +1,40 @@
 """Resilient audio queue - never lose a recording."""
 
 import json
+import os
 import shutil
 import threading
 import time
+import wave
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Callable
 
+import numpy as np
+
 from .config import get_config_dir
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import orjson
+
+    def _dumps_line(entry: dict) -> bytes:
+        return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps_line(entry: dict) -> bytes:
+        return (json.dumps(entry, separators=(",", ":")) + "\n").encode()
+
+    _loads = json.loads
+
 
 @dataclass
 class PendingRecording:
@@ -18,23 +42,17 @@ class PendingRecording:
 
     id: str
     audio_path: Path
-    metadata_path: Path
     timestamp: datetime
     app_bundle_id: str | None
     app_name: str | None
     preset: str | None
 
     @classmethod
-    def from_metadata_file(cls, metadata_path: Path) -> "PendingRecording":
-        """Load a pending recording from its metadata file."""
-        with open(metadata_path) as f:
-            data = json.load(f)
-
-        audio_path = metadata_path.with_suffix(".wav")
+    def from_metadata(cls, queue_dir: Path, data: dict) -> "PendingRecording":
+        """Create a pending recording from a manifest entry."""
         return cls(
-            id=metadata_path.stem,
-            audio_path=audio_path,
-            metadata_path=metadata_path,
+            id=data["id"],
+            audio_path=queue_dir / f"{data['id']}.wav",
             timestamp=datetime.fromisoformat(data["timestamp"]),
             app_bundle_id=data.get("app_bundle_id"),
             app_name=data.get("app_name"),
@@ -48,28 +66,59 @@ class AudioQueue:
     Audio is saved immediately after recording. If transcription fails
     (network down, model not loaded, error), the audio is kept and
     retried later. Only deleted after successful transcription.
+
+    A newly saved recording is "in flight": the caller that saved it is
+    expected to transcribe it and call mark_completed(), or release() to
+    hand it to the background processor, which skips in-flight recordings.
+
+    Audio lives in one WAV file per recording; metadata is kept in a single
+    append-only manifest where each line is either a recording entry or a
+    completion marker for one. The manifest is compacted on startup.
+
+    Several queues may share a directory (the app and `rodin --pending`, or
+    two launches), so appends and compaction hold an exclusive lock on a
+    side file, and writers reopen the manifest if another queue replaced it.
     """
 
+    MANIFEST_NAME = "manifest.jsonl"
+    LOCK_NAME = "manifest.lock"
+
     def __init__(self, queue_dir: Path | None = None):
         if queue_dir is None:
             queue_dir = get_config_dir() / "pending"
         self.queue_dir = queue_dir
         self.queue_dir.mkdir(parents=True, exist_ok=True)
 
+        # Manifest state
+        self.manifest_path = self.queue_dir / self.MANIFEST_NAME
+        self._manifest_lock = threading.Lock()
+        self._pending_ids: set[str] = set()  # Resynced from disk on every scan
+        self._in_flight: set[str] = set()  # Saved and still being handled by the caller
+        self._scanned_manifest: tuple | None = None  # Manifest stat at the last scan
+        self._lock_file = open(self.queue_dir / self.LOCK_NAME, "ab")
+        self._compact_manifest()
+        self._manifest = open(self.manifest_path, "ab", buffering=1 << 16)
+
         # Processing state
         self._processing_lock = threading.Lock()
         self._is_processing = False
         self._stop_event = threading.Event()
+        self._wake = threading.Event()  # Set by release() so a retry starts at once
 
     def save_recording(
         self,
-        audio_data: bytes,
+        samples: np.ndarray,
+        samplerate: int,
         app_bundle_id: str | None = None,
         app_name: str | None = None,
         preset: str | None = None,
     ) -> PendingRecording:
         """Save a recording to the pending queue.
 
+        Args:
+            samples: 16-bit audio samples, shaped (frames,) or (frames, channels).
+            samplerate: Sample rate in Hz.
+
         Returns the PendingRecording object.
         """
         # Generate unique ID from timestamp
@@ -77,25 +126,32 @@ class AudioQueue:
         recording_id = now.strftime("%Y%m%d_%H%M%S_%f")
 
         audio_path = self.queue_dir / f"{recording_id}.wav"
-        metadata_path = self.queue_dir / f"{recording_id}.json"
 
-        # Write audio file first (most important)
-        audio_path.write_bytes(audio_data)
+        # Write audio file first (most important). The samples are handed to
+        # the WAV writer as a buffer, so no intermediate bytes copy is made.
+        samples = np.ascontiguousarray(samples, dtype="<i2")
+        with open(audio_path, "wb", buffering=1 << 19) as f, wave.open(f, "wb") as wav_file:
+            wav_file.setnchannels(samples.shape[1] if samples.ndim > 1 else 1)
+            wav_file.setsampwidth(2)  # 16-bit = 2 bytes
+            wav_file.setframerate(samplerate)
+            wav_file.writeframes(samples)
 
-        # Write metadata
+        # Append metadata to the manifest
         metadata = {
+            "id": recording_id,
             "timestamp": now.isoformat(),
             "app_bundle_id": app_bundle_id,
             "app_name": app_name,
             "preset": preset,
         }
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f)
+        with self._manifest_lock:
+            self._append_manifest(metadata)
+            self._pending_ids.add(recording_id)
+            self._in_flight.add(recording_id)
 
         return PendingRecording(
             id=recording_id,
             audio_path=audio_path,
-            metadata_path=metadata_path,
             timestamp=now,
             app_bundle_id=app_bundle_id,
             app_name=app_name,
@@ -104,45 +160,202 @@ class AudioQueue:
 
     def mark_completed(self, recording: PendingRecording) -> None:
         """Mark a recording as successfully processed - delete it."""
-        try:
-            recording.audio_path.unlink(missing_ok=True)
-            recording.metadata_path.unlink(missing_ok=True)
-        except Exception as e:
-            print(f"Warning: Failed to delete completed recording: {e}")
+        self._mark_completed_batch([recording])
+
+    def _mark_completed_batch(self, recordings: list[PendingRecording]) -> None:
+        """Delete completed recordings and record them in one manifest write."""
+        if not recordings:
+            return
+
+        for recording in recordings:
+            try:
+                os.unlink(recording.audio_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Warning: Failed to delete completed recording: {e}")
+
+        markers = b"".join(
+            _dumps_line({"id": recording.id, "completed": True}) for recording in recordings
+        )
+        with self._manifest_lock:
+            self._write_manifest(markers)
+            self._pending_ids.difference_update(recording.id for recording in recordings)
+            self._in_flight.difference_update(recording.id for recording in recordings)
+
+    def release(self, recording: PendingRecording) -> None:
+        """Hand a recording that could not be processed to the background processor.
+
+        Wakes the processor so the retry starts immediately.
+        """
+        with self._manifest_lock:
+            self._in_flight.discard(recording.id)
+        self._wake.set()
 
     def get_pending(self) -> list[PendingRecording]:
         """Get all pending recordings, oldest first."""
-        recordings = []
+        with self._manifest_lock:
+            self._scanned_manifest = self._manifest_stat()
+            entries = self._read_manifest()
+            audio_ids = self._scan_audio_ids()
+            # Resync the cached IDs, which can't see other queues' writes or
+            # audio that went missing. Entries without audio are dropped on
+            # the next compaction.
+            self._pending_ids = entries.keys() & audio_ids
+            ready_ids = self._pending_ids - self._in_flight
 
-        for metadata_path in sorted(self.queue_dir.glob("*.json")):
+        recordings = []
+        for recording_id, data in entries.items():
+            if recording_id not in ready_ids:
+                continue
             try:
-                recording = PendingRecording.from_metadata_file(metadata_path)
-                # Only include if audio file exists
-                if recording.audio_path.exists():
-                    recordings.append(recording)
-                else:
-                    # Orphaned metadata, clean up
-                    metadata_path.unlink(missing_ok=True)
+                recordings.append(PendingRecording.from_metadata(self.queue_dir, data))
             except Exception as e:
-                print(f"Warning: Failed to load pending recording {metadata_path}: {e}")
+                print(f"Warning: Failed to load pending recording {recording_id}: {e}")
 
         return recordings
 
     def get_pending_count(self) -> int:
         """Get count of pending recordings."""
-        return len(list(self.queue_dir.glob("*.json")))
+        self._rescan_if_changed()
+        return len(self._pending_ids)
+
+    def _rescan_if_changed(self) -> None:
+        """Rescan if the manifest changed since the last get_pending().
+
+        Catches recordings saved or completed by another queue on this
+        directory without reading the manifest on every check.
+        """
+        if self._manifest_stat() != self._scanned_manifest:
+            self.get_pending()
+
+    def _manifest_stat(self) -> tuple | None:
+        """Identify the manifest's current contents by inode, size and mtime."""
+        try:
+            st = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _scan_audio_ids(self) -> set[str]:
+        """Get the IDs of all recordings with an audio file, in one directory scan."""
+        with os.scandir(self.queue_dir) as it:
+            return {entry.name[:-4] for entry in it if entry.name.endswith(".wav")}
+
+    def _append_manifest(self, entry: dict) -> None:
+        """Append one entry to the manifest. Caller must hold the manifest lock."""
+        self._write_manifest(_dumps_line(entry))
+
+    def _write_manifest(self, data: bytes) -> None:
+        """Append raw lines to the manifest. Caller must hold the manifest lock."""
+        with self._file_lock():
+            self._reopen_if_replaced()
+            self._manifest.write(data)
+            self._manifest.flush()
+
+    def _reopen_if_replaced(self) -> None:
+        """Reopen the manifest if another queue compacted it since we opened it.
+
+        Caller must hold the file lock.
+        """
+        try:
+            current = os.stat(self.manifest_path).st_ino
+        except FileNotFoundError:
+            current = None
+        replaced = current != os.fstat(self._manifest.fileno()).st_ino
+        if replaced:
+            self._manifest.close()
+            self._manifest = open(self.manifest_path, "ab", buffering=1 << 16)
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold the lock shared with other queues on this directory.
+
+        A no-op where fcntl is unavailable.
+        """
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _read_manifest(self) -> dict[str, dict]:
+        """Read the manifest and return pending entries by ID, oldest first."""
+        entries: dict[str, dict] = {}
+        try:
+            with open(self.manifest_path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = _loads(line)
+                    except ValueError:
+                        continue  # Torn write from a crash
+                    if entry.get("completed"):
+                        entries.pop(entry["id"], None)
+                    else:
+                        entries[entry["id"]] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _compact_manifest(self) -> None:
+        """Rewrite the manifest with only pending entries.
+
+        Also imports metadata files left by older versions, which stored one
+        JSON file next to each recording.
+        """
+        with self._file_lock():
+            self._rewrite_manifest()
+
+    def _rewrite_manifest(self) -> None:
+        """Compact the manifest. Caller must hold the file lock."""
+        entries = self._read_manifest()
+        audio_ids: set[str] = set()
+        legacy_paths: list[Path] = []
+        with os.scandir(self.queue_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".wav"):
+                    audio_ids.add(entry.name[:-4])
+                elif entry.name.endswith(".json"):
+                    legacy_paths.append(Path(entry.path))
+        legacy_paths.sort()
+
+        for metadata_path in legacy_paths:
+            try:
+                entries[metadata_path.stem] = {
+                    **_loads(metadata_path.read_bytes()),
+                    "id": metadata_path.stem,
+                }
+            except Exception as e:
+                print(f"Warning: Failed to load pending recording {metadata_path}: {e}")
+
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            for recording_id, entry in entries.items():
+                if recording_id in audio_ids:
+                    f.write(_dumps_line(entry))
+                    self._pending_ids.add(recording_id)
+        os.replace(tmp_path, self.manifest_path)
+
+        for metadata_path in legacy_paths:
+            metadata_path.unlink(missing_ok=True)
 
     def process_pending(
         self,
-        process_fn: Callable[[PendingRecording, bytes], bool],
+        process_fn: Callable[[list[PendingRecording]], list[bool]],
         on_progress: Callable[[int, int], None] | None = None,
+        batch_size: int = 8,
     ) -> int:
-        """Process all pending recordings.
+        """Process all pending recordings, several at a time.
 
         Args:
-            process_fn: Function that takes (recording, audio_bytes) and returns
-                       True if successful (recording will be deleted).
+            process_fn: Function that takes a list of recordings and returns
+                       a success flag for each (successful recordings will be
+                       deleted).
             on_progress: Optional callback (processed, total) for progress updates.
+            batch_size: Most recordings handed to process_fn at once.
 
         Returns:
             Number of successfully processed recordings.
@@ -152,44 +365,43 @@ class AudioQueue:
                 return 0
             self._is_processing = True
 
+        completed: list[PendingRecording] = []
         try:
             pending = self.get_pending()
             total = len(pending)
-            processed = 0
 
-            for i, recording in enumerate(pending):
+            for start in range(0, total, batch_size):
                 if self._stop_event.is_set():
                     break
 
+                batch = pending[start:start + batch_size]
                 try:
-                    audio_data = recording.audio_path.read_bytes()
-                    success = process_fn(recording, audio_data)
-
-                    if success:
-                        self.mark_completed(recording)
-                        processed += 1
-
+                    results = process_fn(batch)
+                    completed.extend(
+                        recording for recording, success in zip(batch, results) if success
+                    )
                 except Exception as e:
-                    print(f"Error processing recording {recording.id}: {e}")
+                    print(f"Error processing {len(batch)} recording(s): {e}")
 
                 if on_progress:
-                    on_progress(i + 1, total)
+                    on_progress(start + len(batch), total)
 
-            return processed
+            return len(completed)
 
         finally:
+            self._mark_completed_batch(completed)
             with self._processing_lock:
                 self._is_processing = False
 
     def start_background_processor(
         self,
-        process_fn: Callable[[PendingRecording, bytes], bool],
+        process_fn: Callable[[list[PendingRecording]], list[bool]],
         interval_seconds: float = 30.0,
     ) -> threading.Thread:
         """Start a background thread that periodically processes pending recordings.
 
         Args:
-            process_fn: Function that takes (recording, audio_bytes) and returns True if successful.
+            process_fn: Batch function, as for process_pending().
             interval_seconds: How often to check for pending recordings.
 
         Returns:
@@ -198,8 +410,16 @@ class AudioQueue:
         self._stop_event.clear()
 
         def processor_loop():
-            while not self._stop_event.wait(interval_seconds):
-                count = self.get_pending_count()
+            while True:
+                # Cleared before processing, so a release() that arrives
+                # mid-run makes the next wait return straight away
+                self._wake.wait(timeout=interval_seconds)
+                self._wake.clear()
+                if self._stop_event.is_set():
+                    break
+                self._rescan_if_changed()
+                with self._manifest_lock:
+                    count = len(self._pending_ids - self._in_flight)
                 if count > 0:
                     print(f"Processing {count} pending recording(s)...")
                     processed = self.process_pending(process_fn)
@@ -213,10 +433,24 @@ class AudioQueue:
     def stop_background_processor(self) -> None:
         """Stop the background processor."""
         self._stop_event.set()
+        self._wake.set()
+        self.flush_all()
+
+    def flush_all(self) -> None:
+        """Flush the manifest and sync it to disk.
+
+        Audio files are left to the OS write-back cache; only the manifest,
+        which indexes every pending recording, is fsynced.
+        """
+        with self._manifest_lock, self._file_lock():
+            self._reopen_if_replaced()
+            self._manifest.flush()
+            os.fsync(self._manifest.fileno())
 
     def get_queue_size_bytes(self) -> int:
         """Get total size of pending audio files in bytes."""
-        return sum(f.stat().st_size for f in self.queue_dir.glob("*.wav") if f.exists())
+        with os.scandir(self.queue_dir) as it:
+            return sum(entry.stat().st_size for entry in it if entry.name.endswith(".wav"))
 
     def cleanup_old(self, max_age_days: int = 7) -> int:
         """Remove recordings older than max_age_days.
@@ -226,15 +460,10 @@ class AudioQueue:
         cutoff = datetime.now().timestamp() - (max_age_days * 24 * 60 * 60)
         removed = 0
 
-        for metadata_path in self.queue_dir.glob("*.json"):
-            try:
-                if metadata_path.stat().st_mtime < cutoff:
-                    audio_path = metadata_path.with_suffix(".wav")
-                    metadata_path.unlink(missing_ok=True)
-                    audio_path.unlink(missing_ok=True)
-                    removed += 1
-            except Exception:
-                pass
+        for recording in self.get_pending():
+            if recording.timestamp.timestamp() < cutoff:
+                self.mark_completed(recording)
+                removed += 1
 
         return removed
 
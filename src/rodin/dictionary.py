@@ -1,34 +1,100 @@
 """Personal dictionary for custom word corrections."""
 
 import json
+import os
 import re
 from pathlib import Path
 
 from .config import get_config_dir
+from .stats import TranscriptionDB, get_db
 
 
 class PersonalDictionary:
-    """Manages personal dictionary for word corrections and custom vocabulary."""
+    """Manages personal dictionary for word corrections and custom vocabulary.
 
-    def __init__(self, dictionary_path: Path | None = None):
+    Corrections live in the stats database. To bulk-edit them, export to
+    dictionary.json with export_json(); on the next load that file is merged
+    into the stored corrections and renamed to dictionary.json.bak. Merging
+    keeps anything added or learned since the export, so removing an entry
+    from the file does not delete it; use remove_word() for that.
+    """
+
+    TABLE = "dictionary"
+
+    def __init__(self, dictionary_path: Path | None = None, db: TranscriptionDB | None = None):
         self.dictionary_path = dictionary_path or get_config_dir() / "dictionary.json"
+        self._db = db or get_db()
         self._corrections: dict[str, str] = {}
+        self._lookup: dict[str, str] = {}
+        self._pattern: re.Pattern[str] | None = None
+        self._min_key_len = 0
         self._load()
 
     def _load(self) -> None:
-        """Load dictionary from file."""
+        """Load corrections from the database, importing a dictionary.json first."""
         if self.dictionary_path.exists():
-            with open(self.dictionary_path) as f:
-                data = json.load(f)
-            self._corrections = data.get("corrections", {})
+            self._import_file()
+        self._corrections = self._db.load_entries(self.TABLE)
+        self._rebuild_pattern()
+
+    def _import_file(self) -> None:
+        """Merge dictionary_path into the stored corrections and set the file aside."""
+        try:
+            count = self.import_json(self.dictionary_path)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Failed to import {self.dictionary_path}: {e}")
+            return
+        backup_path = self.dictionary_path.with_name(self.dictionary_path.name + ".bak")
+        os.replace(self.dictionary_path, backup_path)
+        print(f"Imported {count} dictionary entries from {self.dictionary_path}")
+
+    def _rebuild_pattern(self) -> None:
+        """Compile all correction keys into one case-insensitive alternation.
+
+        Longer keys come first so they win over keys they contain.
+        """
+        self._lookup = {key.lower(): value for key, value in self._corrections.items() if key}
+        if not self._lookup:
+            self._pattern = None
+            return
+        keys = sorted(self._lookup, key=len, reverse=True)
+        self._min_key_len = len(keys[-1])
+        alternation = "|".join(re.escape(key) for key in keys)
+        self._pattern = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+    def import_json(self, path: Path, replace: bool = False) -> int:
+        """Import corrections from a JSON file.
+
+        Args:
+            path: File in the {"corrections": {...}} format written by export_json
+            replace: Drop existing corrections instead of merging
+
+        Returns:
+            Number of corrections imported
+        """
+        with open(path) as f:
+            corrections = json.load(f).get("corrections", {})
+        self._db.save_entries(self.TABLE, corrections, replace=replace)
+        if replace:
+            self._corrections = dict(corrections)
         else:
-            self._corrections = {}
+            self._corrections.update(corrections)
+        self._rebuild_pattern()
+        return len(corrections)
+
+    def export_json(self, path: Path | None = None) -> Path:
+        """Write all corrections to a JSON file, dictionary_path by default.
 
-    def _save(self) -> None:
-        """Save dictionary to file."""
+        Returns:
+            The path written
+        """
+        path = path or self.dictionary_path
         data = {"corrections": self._corrections}
-        with open(self.dictionary_path, "w") as f:
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)  # Atomic, never leaves a partial file
+        return path
 
     def add_word(self, spoken: str, corrected: str) -> None:
         """Add a word correction to the dictionary.
@@ -37,8 +103,12 @@ class PersonalDictionary:
             spoken: How the word sounds when spoken (lowercase)
             corrected: The correct spelling/capitalization
         """
-        self._corrections[spoken.lower()] = corrected
-        self._save()
+        key = spoken.lower()
+        if self._corrections.get(key) == corrected:
+            return  # Already known; skip the rebuild and write
+        self._corrections[key] = corrected
+        self._rebuild_pattern()
+        self._db.save_entries(self.TABLE, {key: corrected})
 
     def remove_word(self, spoken: str) -> bool:
         """Remove a word from the dictionary.
@@ -49,10 +119,19 @@ class PersonalDictionary:
         key = spoken.lower()
         if key in self._corrections:
             del self._corrections[key]
-            self._save()
+            self._rebuild_pattern()
+            self._db.delete_entry(self.TABLE, key)
             return True
         return False
 
+    @property
+    def lookup(self) -> dict[str, str]:
+        """Corrections keyed by lowercase key, as used for matching.
+
+        Replaced (not mutated) whenever the corrections change; do not modify.
+        """
+        return self._lookup
+
     def get_corrections(self) -> dict[str, str]:
         """Get all corrections."""
         return self._corrections.copy()
@@ -63,31 +142,45 @@ class PersonalDictionary:
         Performs case-insensitive matching but preserves the
         correction's capitalization.
         """
-        if not self._corrections:
+        # Nothing to match, or text too short to contain any key
+        if self._pattern is None or len(text) < self._min_key_len:
             return text
 
-        result = text
-        for spoken, corrected in self._corrections.items():
-            # Case-insensitive word boundary match
-            pattern = re.compile(rf'\b{re.escape(spoken)}\b', re.IGNORECASE)
-            result = pattern.sub(corrected, result)
-
-        return result
+        lookup = self._lookup
+        return self._pattern.sub(lambda m: lookup.get(m.group(0).lower(), m.group(0)), text)
 
     def learn_from_correction(self, original: str, corrected: str) -> None:
         """Learn new words by comparing original and corrected text.
 
         Identifies words that were changed and adds them to the dictionary.
         """
-        original_words = original.lower().split()
+        original_lower = original.lower()
+        corrected_lower_text = corrected.lower()
+        if original_lower == corrected_lower_text:
+            return  # Only capitalization changed; no word differs
+
+        original_words = original_lower.split()
         corrected_words = corrected.split()
+        if len(original_words) != len(corrected_words):
+            return
+        corrected_lower = corrected_lower_text.split()
 
         # Simple heuristic: if a word was changed but sounds similar,
         # it's likely a spelling/capitalization correction
-        if len(original_words) == len(corrected_words):
-            for orig, corr in zip(original_words, corrected_words):
-                if orig != corr.lower() and self._sounds_similar(orig, corr.lower()):
-                    self.add_word(orig, corr)
+        learned: dict[str, str] = {}
+        for orig, corr_lower, corr in zip(original_words, corrected_lower, corrected_words):
+            if (
+                orig != corr_lower
+                and self._corrections.get(orig) != corr
+                and self._sounds_similar(orig, corr_lower)
+            ):
+                learned[orig] = corr
+
+        # Rebuild and save once for all learned words
+        if learned:
+            self._corrections.update(learned)
+            self._rebuild_pattern()
+            self._db.save_entries(self.TABLE, learned)
 
     def _sounds_similar(self, word1: str, word2: str) -> bool:
         """Check if two words sound similar (basic heuristic)."""
@@ -2,6 +2,7 @@
 
 import argparse
 import sys
+from pathlib import Path
 
 from .config import load_settings, save_settings
 
@@ -86,6 +87,13 @@ def main() -> None:
         action="store_true",
         help="List all words in personal dictionary",
     )
+    parser.add_argument(
+        "--export-dictionary",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Export the dictionary to JSON (default: dictionary.json in the config dir)",
+    )
 
     # Snippet management
     parser.add_argument(
@@ -104,6 +112,13 @@ def main() -> None:
         action="store_true",
         help="List all snippets",
     )
+    parser.add_argument(
+        "--export-snippets",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Export snippets to JSON for editing (default: snippets.json in the config dir)",
+    )
 
     # Stats and history
     parser.add_argument(
@@ -193,6 +208,16 @@ def main() -> None:
             print("Dictionary is empty. Add words with: --add-word 'spoken' 'Corrected'")
         return
 
+    if args.export_dictionary is not None:
+        from .dictionary import PersonalDictionary
+        dictionary = PersonalDictionary()
+        export_path = Path(args.export_dictionary) if args.export_dictionary else None
+        path = dictionary.export_json(export_path)
+        print(f"Exported {len(dictionary.get_corrections())} words to {path}")
+        if path == dictionary.dictionary_path:
+            print("Edits are merged in on the next launch; use --remove-word to delete entries.")
+        return
+
     # Snippet management commands
     if args.add_snippet:
         from .snippets import SnippetExpander
@@ -225,6 +250,16 @@ def main() -> None:
             print("No snippets. Add with: --add-snippet 'trigger' 'expansion text'")
         return
 
+    if args.export_snippets is not None:
+        from .snippets import SnippetExpander
+        snippets = SnippetExpander()
+        export_path = Path(args.export_snippets) if args.export_snippets else None
+        path = snippets.export_json(export_path)
+        print(f"Exported {len(snippets.list_snippets())} snippets to {path}")
+        if path == snippets.snippets_path:
+            print("Edits are merged in on the next launch; use --remove-snippet to delete entries.")
+        return
+
     # Stats commands
     if args.stats or args.stats_today or args.stats_week or args.stats_month or args.stats_year:
         from .stats import get_db
@@ -406,7 +441,7 @@ def run_cli(settings) -> None:
                 )
                 print(f"✨ Edited: {text}")
 
-            typer.type_text(text)
+            typer.type_text(text).result()
             print("✅ Text inserted")
 
         except Exception as e:
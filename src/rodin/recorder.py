@@ -70,9 +70,28 @@ class AudioRecorder:
 
     def stop(self) -> bytes:
         """Stop recording and return audio data as WAV bytes."""
-        if not self._is_recording:
+        audio_data = self.stop_samples()
+        if audio_data.size == 0:
             return b""
 
+        # Convert to WAV bytes
+        wav_buffer = io.BytesIO()
+        with wave.open(wav_buffer, "wb") as wav_file:
+            wav_file.setnchannels(self.config.channels)
+            wav_file.setsampwidth(2)  # 16-bit = 2 bytes
+            wav_file.setframerate(self.config.sample_rate)
+            wav_file.writeframes(audio_data.tobytes())
+
+        return wav_buffer.getvalue()
+
+    def stop_samples(self) -> np.ndarray:
+        """Stop recording and return the raw samples.
+
+        Returns an empty array if nothing was recorded.
+        """
+        if not self._is_recording:
+            return np.empty(0, dtype=self.config.dtype)
+
         self._is_recording = False
 
         if self._stream:
@@ -86,20 +105,10 @@ class AudioRecorder:
             audio_chunks.append(self._audio_queue.get())
 
         if not audio_chunks:
-            return b""
+            return np.empty(0, dtype=self.config.dtype)
 
         # Concatenate all chunks
-        audio_data = np.concatenate(audio_chunks)
-
-        # Convert to WAV bytes
-        wav_buffer = io.BytesIO()
-        with wave.open(wav_buffer, "wb") as wav_file:
-            wav_file.setnchannels(self.config.channels)
-            wav_file.setsampwidth(2)  # 16-bit = 2 bytes
-            wav_file.setframerate(self.config.sample_rate)
-            wav_file.writeframes(audio_data.tobytes())
-
-        return wav_buffer.getvalue()
+        return np.concatenate(audio_chunks)
 
     def is_recording(self) -> bool:
         """Check if currently recording."""
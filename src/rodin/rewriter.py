@@ -0,0 +1,108 @@
+"""Single-pass dictionary correction and snippet expansion."""
+
+import re
+
+from .dictionary import PersonalDictionary
+from .snippets import SnippetExpander
+
+# Entries the single pass handles exactly: one word, no spaces or punctuation
+_WORD = re.compile(r"\w+")
+
+
+class TextRewriter:
+    """Applies dictionary corrections and snippet expansions in one pass.
+
+    Equivalent to PersonalDictionary.apply followed by SnippetExpander.expand
+    when nothing runs in between. That only holds while every key and
+    correction is a single word: a multi-word key or correction can form or
+    hide a match the other pass would find. Otherwise fusable() is False
+    and callers run the two passes in order.
+    """
+
+    def __init__(self, dictionary: PersonalDictionary, snippets: SnippetExpander):
+        self.dictionary = dictionary
+        self.snippets = snippets
+
+        # Built lazily and rebuilt whenever either lookup table is replaced
+        self._sources: tuple[dict[str, str], dict[str, str]] | None = None
+        self._table: dict[str, tuple[str, str]] = {}
+        self._expanding: set[str] = set()  # Keys whose replacement is a snippet
+        self._pattern: re.Pattern[str] | None = None
+        self._fusable = True
+
+    def fusable(self) -> bool:
+        """Check whether the current entries can be applied in one pass."""
+        self._rebuild()
+        return self._fusable
+
+    def _rebuild(self) -> None:
+        """Merge both lookup tables into one pattern, if either has changed."""
+        corrections = self.dictionary.lookup
+        expansions = self.snippets.lookup
+        sources = self._sources
+        if sources is not None and sources[0] is corrections and sources[1] is expansions:
+            return
+        self._sources = (corrections, expansions)
+
+        words = (*corrections, *corrections.values(), *expansions)
+        self._fusable = all(_WORD.fullmatch(word) for word in words)
+        if not self._fusable:
+            self._table = {}
+            self._expanding = set()
+            self._pattern = None
+            return
+
+        # Each key maps to (kind, replacement); corrections take precedence
+        # and chain into a snippet when the corrected word is a trigger, which
+        # counts as a snippet firing.
+        table = {key: ("snippet", expansion) for key, expansion in expansions.items()}
+        expanding = set(expansions)
+        for key, corrected in corrections.items():
+            expansion = expansions.get(corrected.lower())
+            if expansion is None:
+                table[key] = ("dict", corrected)
+                expanding.discard(key)
+            else:
+                table[key] = ("snippet", expansion)
+                expanding.add(key)
+        self._table = table
+        self._expanding = expanding
+
+        if not table:
+            self._pattern = None
+            return
+        keys = sorted(table, key=len, reverse=True)
+        alternation = "|".join(re.escape(key) for key in keys)
+        self._pattern = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+    def apply(self, text: str) -> tuple[str, list[tuple[str, str]]]:
+        """Rewrite text.
+
+        Only valid while fusable() is True.
+
+        Returns:
+            Tuple of (rewritten_text, fired) where fired lists the
+            ("dict" | "snippet", key) pairs that matched, in order.
+        """
+        self._rebuild()
+        if self._pattern is None:
+            return text, []
+
+        table = self._table
+        fired: list[tuple[str, str]] = []
+
+        # Entire text expands to a snippet (mirrors SnippetExpander.expand)
+        text_lower = text.strip().lower()
+        if text_lower in self._expanding:
+            kind, replacement = table[text_lower]
+            return replacement, [(kind, text_lower)]
+
+        def replace(match: re.Match[str]) -> str:
+            key = match.group(0).lower()
+            entry = table.get(key)
+            if entry is None:
+                return match.group(0)
+            fired.append((entry[0], key))
+            return entry[1]
+
+        return self._pattern.sub(replace, text), fired
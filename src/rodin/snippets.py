@@ -1,34 +1,123 @@
 """Snippet expansion for text shortcuts."""
 
 import json
+import os
 import re
 from pathlib import Path
 
 from .config import get_config_dir
+from .stats import TranscriptionDB, get_db
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _is_word_char(char: str) -> bool:
+    """Match the regex definition of a word character."""
+    return char.isalnum() or char == "_"
 
 
 class SnippetExpander:
-    """Manages text snippets that expand trigger words into full text."""
+    """Manages text snippets that expand trigger words into full text.
 
-    def __init__(self, snippets_path: Path | None = None):
+    Snippets are stored in the stats database. A snippets.json file in
+    the config directory is merged into the stored snippets on load, and
+    then renamed to snippets.json.bak; export_json() writes one for bulk
+    editing. Removing an entry from the file does not delete the snippet;
+    use remove_snippet() for that.
+    """
+
+    TABLE = "snippets"
+
+    def __init__(self, snippets_path: Path | None = None, db: TranscriptionDB | None = None):
         self.snippets_path = snippets_path or get_config_dir() / "snippets.json"
+        self._db = db or get_db()
         self._snippets: dict[str, str] = {}
+        self._lookup: dict[str, str] = {}
+        self._pattern: re.Pattern[str] | None = None
+        self._min_key_len = 0
+        self._max_key_len = 0
+        self._automaton = None
         self._load()
 
     def _load(self) -> None:
-        """Load snippets from file."""
+        """Load snippets from the database, importing a snippets.json first."""
         if self.snippets_path.exists():
-            with open(self.snippets_path) as f:
-                data = json.load(f)
-            self._snippets = data.get("snippets", {})
+            self._import_file()
+        self._snippets = self._db.load_entries(self.TABLE)
+        self._rebuild_pattern()
+
+    def _import_file(self) -> None:
+        """Merge snippets_path into the stored snippets and set the file aside."""
+        try:
+            count = self.import_json(self.snippets_path)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Failed to import {self.snippets_path}: {e}")
+            return
+        backup_path = self.snippets_path.with_name(self.snippets_path.name + ".bak")
+        os.replace(self.snippets_path, backup_path)
+        print(f"Imported {count} snippets from {self.snippets_path}")
+
+    def _rebuild_pattern(self) -> None:
+        """Compile all snippet keys into one case-insensitive alternation.
+
+        Longer keys come first so they win over keys they contain.
+        """
+        self._lookup = {key.lower(): value for key, value in self._snippets.items() if key}
+        if not self._lookup:
+            self._pattern = None
+            self._automaton = None
+            return
+        keys = sorted(self._lookup, key=len, reverse=True)
+        self._min_key_len = len(keys[-1])
+        self._max_key_len = len(keys[0])
+        alternation = "|".join(re.escape(key) for key in keys)
+        self._pattern = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for key, expansion in self._lookup.items():
+                automaton.add_word(key, (len(key), expansion))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def import_json(self, path: Path, replace: bool = False) -> int:
+        """Import snippets from a JSON file.
+
+        Args:
+            path: File in the {"snippets": {...}} format written by export_json
+            replace: Drop existing snippets instead of merging
+
+        Returns:
+            Number of snippets imported
+        """
+        with open(path) as f:
+            snippets = json.load(f).get("snippets", {})
+        self._db.save_entries(self.TABLE, snippets, replace=replace)
+        if replace:
+            self._snippets = dict(snippets)
         else:
-            self._snippets = {}
+            self._snippets.update(snippets)
+        self._rebuild_pattern()
+        return len(snippets)
 
-    def _save(self) -> None:
-        """Save snippets to file."""
+    def export_json(self, path: Path | None = None) -> Path:
+        """Write all snippets to a JSON file, snippets_path by default.
+
+        Returns:
+            The path written
+        """
+        path = path or self.snippets_path
         data = {"snippets": self._snippets}
-        with open(self.snippets_path, "w") as f:
+        # Write to a temporary file and swap it in, so a crash mid-write
+        # never leaves a truncated file behind
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+        return path
 
     def add_snippet(self, trigger: str, expansion: str) -> None:
         """Add a snippet.
@@ -37,8 +126,10 @@ class SnippetExpander:
             trigger: The word/phrase that triggers expansion
             expansion: The full text to expand to
         """
-        self._snippets[trigger.lower()] = expansion
-        self._save()
+        key = trigger.lower()
+        self._snippets[key] = expansion
+        self._rebuild_pattern()
+        self._db.save_entries(self.TABLE, {key: expansion})
 
     def remove_snippet(self, trigger: str) -> bool:
         """Remove a snippet.
@@ -49,10 +140,19 @@ class SnippetExpander:
         key = trigger.lower()
         if key in self._snippets:
             del self._snippets[key]
-            self._save()
+            self._rebuild_pattern()
+            self._db.delete_entry(self.TABLE, key)
             return True
         return False
 
+    @property
+    def lookup(self) -> dict[str, str]:
+        """Snippets keyed by lowercase key, as used for matching.
+
+        Replaced (not mutated) whenever the snippets change; do not modify.
+        """
+        return self._lookup
+
     def get_snippets(self) -> dict[str, str]:
         """Get all snippets."""
         return self._snippets.copy()
@@ -64,22 +164,64 @@ class SnippetExpander:
         replaces it completely. Otherwise, expands triggers as
         word boundaries.
         """
-        if not self._snippets:
+        # Nothing to match, or text too short to contain any key
+        if self._pattern is None or len(text) < self._min_key_len:
             return text
 
-        # Check if entire text is a snippet trigger
-        text_lower = text.strip().lower()
-        if text_lower in self._snippets:
-            return self._snippets[text_lower]
-
-        # Otherwise, expand triggers found within text
-        result = text
-        for trigger, expansion in self._snippets.items():
-            # Case-insensitive word boundary match
-            pattern = re.compile(rf'\b{re.escape(trigger)}\b', re.IGNORECASE)
-            result = pattern.sub(expansion, result)
-
-        return result
+        # Check if entire text is a snippet trigger; longer text can't be,
+        # so skip lowercasing a copy of it
+        lookup = self._lookup
+        stripped = text.strip()
+        if len(stripped) <= self._max_key_len:
+            text_lower = stripped.lower()
+            if text_lower in lookup:
+                return lookup[text_lower]
+
+        # Otherwise, expand triggers found within text in a single pass
+        if self._automaton is not None:
+            lowered = text.lower()
+            # Lowercasing can change the length of some characters, which
+            # would misalign match offsets
+            if len(lowered) == len(text):
+                return self._expand_automaton(text, lowered)
+        return self._pattern.sub(lambda m: lookup.get(m.group(0).lower(), m.group(0)), text)
+
+    def _expand_automaton(self, text: str, lowered: str) -> str:
+        """Expand triggers using the Aho-Corasick automaton.
+
+        Matches the regex path: triggers must sit on word boundaries,
+        and the leftmost, then longest, trigger wins.
+        """
+        matches = sorted(
+            (end - length + 1, -length, expansion)
+            for end, (length, expansion) in self._automaton.iter(lowered)
+        )
+
+        parts: list[str] = []
+        last_end = 0
+        text_len = len(text)
+        for start, neg_length, expansion in matches:
+            if start < last_end:
+                continue
+            end = start - neg_length
+            first_is_word = _is_word_char(text[start])
+            if start > 0 and _is_word_char(text[start - 1]) == first_is_word:
+                continue
+            if start == 0 and not first_is_word:
+                continue
+            last_is_word = _is_word_char(text[end - 1])
+            if end < text_len and _is_word_char(text[end]) == last_is_word:
+                continue
+            if end == text_len and not last_is_word:
+                continue
+            parts.append(text[last_end:start])
+            parts.append(expansion)
+            last_end = end
+
+        if not parts:
+            return text
+        parts.append(text[last_end:])
+        return "".join(parts)
 
     def list_snippets(self) -> list[tuple[str, str]]:
         """List all snippets as (trigger, expansion) tuples."""
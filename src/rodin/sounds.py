@@ -3,6 +3,10 @@
 import sys
 from pathlib import Path
 
+# Loaded sounds, reused so each play is a single message send
+_SOUND_CACHE: dict = {}
+_WINDOWS_SOUNDS: dict[str, int] | None = None
+
 
 def play_start_sound() -> None:
     """Play sound when recording starts."""
@@ -39,40 +43,54 @@ def play_error_sound() -> None:
 def _play_macos_sound(name: str) -> None:
     """Play a macOS system sound."""
     try:
-        from AppKit import NSSound
-
-        # Try system sounds first
-        sound = NSSound.soundNamed_(name)
-        if sound:
-            sound.play()
-            return
-
-        # Try /System/Library/Sounds/
-        sound_path = Path(f"/System/Library/Sounds/{name}.aiff")
-        if sound_path.exists():
-            sound = NSSound.alloc().initWithContentsOfFile_byReference_(
-                str(sound_path), True
-            )
-            if sound:
-                sound.play()
-
-    except Exception as e:
+        sound = _SOUND_CACHE.get(name)
+        if sound is None:
+            sound = _load_macos_sound(name)
+            if sound is None:
+                return
+            _SOUND_CACHE[name] = sound
+
+        # A sound that is still playing ignores play(), so restart it
+        if sound.isPlaying():
+            sound.stop()
+        sound.play()
+
+    except Exception:
         # Silently fail - sounds are optional
         pass
 
 
+def _load_macos_sound(name: str):
+    """Load a macOS system sound by name, or return None if not found."""
+    from AppKit import NSSound
+
+    # Try system sounds first
+    sound = NSSound.soundNamed_(name)
+    if sound:
+        return sound
+
+    # Try /System/Library/Sounds/
+    sound_path = Path(f"/System/Library/Sounds/{name}.aiff")
+    if sound_path.exists():
+        return NSSound.alloc().initWithContentsOfFile_byReference_(str(sound_path), True)
+
+    return None
+
+
 def _play_windows_sound(sound_type: str) -> None:
     """Play a Windows system sound."""
+    global _WINDOWS_SOUNDS
     try:
         import winsound
 
-        sounds = {
-            "start": winsound.MB_OK,
-            "stop": winsound.MB_OK,
-            "success": winsound.MB_OK,
-            "error": winsound.MB_ICONHAND,
-        }
-        winsound.MessageBeep(sounds.get(sound_type, winsound.MB_OK))
+        if _WINDOWS_SOUNDS is None:
+            _WINDOWS_SOUNDS = {
+                "start": winsound.MB_OK,
+                "stop": winsound.MB_OK,
+                "success": winsound.MB_OK,
+                "error": winsound.MB_ICONHAND,
+            }
+        winsound.MessageBeep(_WINDOWS_SOUNDS.get(sound_type, winsound.MB_OK))
 
     except Exception:
         # Silently fail - sounds are optional
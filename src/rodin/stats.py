@@ -1,13 +1,26 @@
 """Transcription statistics and history tracking."""
 
+import atexit
+import itertools
+import queue
+import re
 import sqlite3
-from collections import Counter
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import Callable, TypeVar
 
 from .config import get_config_dir
 
+# Words tracked in word_counts: 3+ characters starting with a letter and
+# ending with a letter or digit, so surrounding punctuation is never included.
+_WORD_RE = re.compile(r"[^\W\d_][\w']+[^\W_]")
+
+T = TypeVar("T")
+
 
 @dataclass
 class TranscriptionRecord:
@@ -56,28 +69,123 @@ class TranscriptionDB:
         char_count INTEGER NOT NULL,
         app_bundle_id TEXT,
         app_name TEXT,
-        preset_used TEXT
+        preset_used TEXT,
+        day TEXT GENERATED ALWAYS AS (date(timestamp)) VIRTUAL
     );
 
     CREATE INDEX IF NOT EXISTS idx_timestamp ON transcriptions(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_day ON transcriptions(day);
     CREATE INDEX IF NOT EXISTS idx_app_bundle_id ON transcriptions(app_bundle_id);
+    CREATE INDEX IF NOT EXISTS idx_timestamp_app_name ON transcriptions(timestamp, app_name);
 
     CREATE TABLE IF NOT EXISTS word_counts (
         word TEXT PRIMARY KEY,
         count INTEGER NOT NULL DEFAULT 0
     );
+
+    CREATE TABLE IF NOT EXISTS dictionary (
+        spoken TEXT PRIMARY KEY,
+        corrected TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS snippets (
+        trigger TEXT PRIMARY KEY,
+        expansion TEXT NOT NULL
+    );
     """
 
+    # User-managed key/value tables: table name -> (key column, value column)
+    ENTRY_TABLES = {
+        "dictionary": ("spoken", "corrected"),
+        "snippets": ("trigger", "expansion"),
+    }
+
+    INSERT_TRANSCRIPTION = """
+    INSERT INTO transcriptions
+    (timestamp, raw_text, edited_text, duration_seconds, word_count, char_count,
+     app_bundle_id, app_name, preset_used)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    UPSERT_WORD_COUNT = """
+    INSERT INTO word_counts (word, count) VALUES (?, ?)
+    ON CONFLICT(word) DO UPDATE SET count = count + excluded.count
+    """
+
+    # Number of cached query results kept in memory
+    CACHE_SIZE = 16
+
     def __init__(self, db_path: Path | None = None):
         if db_path is None:
             db_path = get_config_dir() / "transcriptions.db"
         self.db_path = db_path
+
+        # One long-lived connection in autocommit mode; transactions are
+        # opened explicitly so each recording costs a single commit.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
         self._init_db()
 
+        # Query results are cached under keys that include the write version,
+        # so a result computed before a write can never be served after it.
+        self._version = 0
+        self._cache: OrderedDict[tuple, object] = OrderedDict()
+
+        # Writes are queued and applied by a background thread so recording
+        # a transcription never blocks on disk I/O. Pending writes are drained
+        # on exit.
+        self._queue: queue.Queue[dict | None] = queue.Queue()
+        self._local_ids = itertools.count(1)
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+        atexit.register(self.close)
+
     def _init_db(self) -> None:
         """Initialize the database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript(self.SCHEMA)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._migrate()
+            self._conn.executescript(self.SCHEMA)
+
+    def _migrate(self) -> None:
+        """Bring tables created by older versions up to the current schema."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_xinfo(transcriptions)")}
+        if columns and "day" not in columns:
+            self._conn.execute(
+                "ALTER TABLE transcriptions ADD COLUMN "
+                "day TEXT GENERATED ALWAYS AS (date(timestamp)) VIRTUAL"
+            )
+
+    def _writer_loop(self) -> None:
+        """Apply queued writes until a None sentinel is received."""
+        while True:
+            payload = self._queue.get()
+            try:
+                if payload is None:
+                    return
+                future = payload.pop("future")
+                try:
+                    future.set_result(self._write(**payload))
+                except Exception as e:
+                    print(f"Warning: Failed to record transcription: {e}")
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until all queued writes have been applied."""
+        if self._writer_thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Drain pending writes and close the database connection."""
+        if self._writer_thread.is_alive():
+            self._queue.put(None)
+            self._writer_thread.join()
+        with self._lock:
+            self._conn.close()
 
     def record(
         self,
@@ -90,56 +198,141 @@ class TranscriptionDB:
     ) -> int:
         """Record a transcription.
 
+        The write is queued and applied in the background. Returns a local,
+        monotonically increasing ID; use record_async() for the record ID.
+        """
+        local_id, _ = self._enqueue(
+            raw_text, edited_text, duration_seconds, app_bundle_id, app_name, preset_used
+        )
+        return local_id
+
+    def record_async(
+        self,
+        raw_text: str,
+        edited_text: str | None,
+        duration_seconds: float,
+        app_bundle_id: str | None = None,
+        app_name: str | None = None,
+        preset_used: str | None = None,
+    ) -> Future[int]:
+        """Record a transcription.
+
+        Returns a Future that resolves to the record ID once written.
+        """
+        _, future = self._enqueue(
+            raw_text, edited_text, duration_seconds, app_bundle_id, app_name, preset_used
+        )
+        return future
+
+    def _enqueue(
+        self,
+        raw_text: str,
+        edited_text: str | None,
+        duration_seconds: float,
+        app_bundle_id: str | None,
+        app_name: str | None,
+        preset_used: str | None,
+    ) -> tuple[int, Future[int]]:
+        """Queue a transcription for the background writer."""
+        local_id = next(self._local_ids)
+        future: Future[int] = Future()
+        self._queue.put(
+            {
+                "future": future,
+                "timestamp": datetime.now(),
+                "raw_text": raw_text,
+                "edited_text": edited_text,
+                "duration_seconds": duration_seconds,
+                "app_bundle_id": app_bundle_id,
+                "app_name": app_name,
+                "preset_used": preset_used,
+            }
+        )
+        return local_id, future
+
+    def _write(
+        self,
+        timestamp: datetime,
+        raw_text: str,
+        edited_text: str | None,
+        duration_seconds: float,
+        app_bundle_id: str | None,
+        app_name: str | None,
+        preset_used: str | None,
+    ) -> int:
+        """Write a transcription and its word counts in one transaction.
+
         Returns the record ID.
         """
         # Use edited text for counts if available, otherwise raw
         text_for_counts = edited_text or raw_text
-        words = text_for_counts.split()
-        word_count = len(words)
+        word_count = len(text_for_counts.split())
         char_count = len(text_for_counts)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO transcriptions
-                (timestamp, raw_text, edited_text, duration_seconds, word_count, char_count, app_bundle_id, app_name, preset_used)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    datetime.now().isoformat(),
-                    raw_text,
-                    edited_text,
-                    duration_seconds,
-                    word_count,
-                    char_count,
-                    app_bundle_id,
-                    app_name,
-                    preset_used,
-                ),
-            )
-            record_id = cursor.lastrowid
-
-            # Update word counts (lowercase, filter short words)
-            for word in words:
-                word_lower = word.lower().strip(".,!?;:\"'()[]{}").strip()
-                if len(word_lower) >= 3:  # Skip very short words
-                    conn.execute(
-                        """
-                        INSERT INTO word_counts (word, count) VALUES (?, 1)
-                        ON CONFLICT(word) DO UPDATE SET count = count + 1
-                        """,
-                        (word_lower,),
-                    )
+        # Very short transcriptions ("ok", "yes") are not worth tracking in
+        # word_counts; they are written with a single autocommit INSERT.
+        word_counter = None
+        if word_count >= 2:
+            word_counter = Counter(m.group(0).lower() for m in _WORD_RE.finditer(text_for_counts))
+
+        row = (
+            timestamp.isoformat(),
+            raw_text,
+            edited_text,
+            duration_seconds,
+            word_count,
+            char_count,
+            app_bundle_id,
+            app_name,
+            preset_used,
+        )
+
+        with self._lock:
+            conn = self._conn
+            if word_counter is None:
+                record_id = conn.execute(self.INSERT_TRANSCRIPTION, row).lastrowid
+            else:
+                conn.execute("BEGIN")
+                try:
+                    record_id = conn.execute(self.INSERT_TRANSCRIPTION, row).lastrowid
+                    conn.executemany(self.UPSERT_WORD_COUNT, word_counter.items())
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            self._version += 1
 
         return record_id
 
+    def _cached(self, key: tuple, compute: Callable[[], T]) -> T:
+        """Return the cached result for key, computing and storing it on a miss."""
+        self.flush()
+        with self._lock:
+            key = (*key, self._version)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        value = compute()
+
+        with self._lock:
+            self._cache[key] = value
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return value
+
     def get_stats(
         self,
         since: datetime | None = None,
         until: datetime | None = None,
     ) -> Stats:
         """Get aggregated statistics for a time period."""
-        with sqlite3.connect(self.db_path) as conn:
+        return self._cached(("stats", since, until), lambda: self._query_stats(since, until))
+
+    def _query_stats(self, since: datetime | None, until: datetime | None) -> Stats:
+        """Compute aggregated statistics for a time period."""
+        with self._lock:
+            conn = self._conn
             # Build date filter
             where_clause = "1=1"
             params: list = []
@@ -150,91 +343,87 @@ class TranscriptionDB:
                 where_clause += " AND timestamp < ?"
                 params.append(until.isoformat())
 
-            # Basic aggregates
-            row = conn.execute(
-                f"""
-                SELECT
-                    COUNT(*) as total,
-                    COALESCE(SUM(word_count), 0) as words,
-                    COALESCE(SUM(char_count), 0) as chars,
-                    COALESCE(SUM(duration_seconds), 0) as duration
-                FROM transcriptions
-                WHERE {where_clause}
-                """,
-                params,
-            ).fetchone()
-
-            total_transcriptions = row[0]
-            total_words = row[1]
-            total_chars = row[2]
-            total_duration = row[3]
-
-            # Estimated typing time (45 WPM average)
-            estimated_typing_time = (total_words / 45) * 60 if total_words > 0 else 0
-            time_saved = max(0, estimated_typing_time - total_duration)
-
-            avg_words = total_words / total_transcriptions if total_transcriptions > 0 else 0
+            all_time = since is None and until is None
+
+            # Every aggregate comes back from one statement as tagged rows:
+            # (tag, key, value, ...) over the filtered rowset.
+            query = f"""
+                WITH filtered AS (SELECT * FROM transcriptions WHERE {where_clause})
+                SELECT 'total', COUNT(*), COALESCE(SUM(word_count), 0),
+                       COALESCE(SUM(char_count), 0), COALESCE(SUM(duration_seconds), 0)
+                FROM filtered
+                UNION ALL
+                SELECT * FROM (
+                    SELECT 'hour', CAST(strftime('%H', timestamp) AS INTEGER) AS hour,
+                           COUNT(*) AS cnt, NULL, NULL
+                    FROM filtered GROUP BY hour ORDER BY cnt DESC LIMIT 1
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT 'dow', CAST(strftime('%w', timestamp) AS INTEGER) AS dow,
+                           COUNT(*) AS cnt, NULL, NULL
+                    FROM filtered GROUP BY dow ORDER BY cnt DESC LIMIT 1
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT 'app', app_name, COUNT(*) AS cnt, NULL, NULL
+                    FROM filtered WHERE app_name IS NOT NULL
+                    GROUP BY app_name ORDER BY cnt DESC LIMIT 10
+                )
+                UNION ALL
+            """
+            if all_time:
+                # Top words come from the running word_counts table
+                query += """
+                SELECT * FROM (
+                    SELECT 'word', word, count, NULL, NULL
+                    FROM word_counts ORDER BY count DESC LIMIT 50
+                )
+                """
+            else:
+                # For a specific period, word counts are recalculated from text,
+                # skipping the short transcriptions record() leaves out of
+                # word_counts so both views agree
+                query += """
+                SELECT 'text', COALESCE(edited_text, raw_text), NULL, NULL, NULL
+                FROM filtered WHERE word_count >= 2
+                """
 
-            # Most active hour
-            hour_row = conn.execute(
-                f"""
-                SELECT CAST(strftime('%H', timestamp) AS INTEGER) as hour, COUNT(*) as cnt
-                FROM transcriptions
-                WHERE {where_clause}
-                GROUP BY hour
-                ORDER BY cnt DESC
-                LIMIT 1
-                """,
-                params,
-            ).fetchone()
-            most_active_hour = hour_row[0] if hour_row else None
-
-            # Most active day of week
-            day_row = conn.execute(
-                f"""
-                SELECT strftime('%w', timestamp) as dow, COUNT(*) as cnt
-                FROM transcriptions
-                WHERE {where_clause}
-                GROUP BY dow
-                ORDER BY cnt DESC
-                LIMIT 1
-                """,
-                params,
-            ).fetchone()
+            total_transcriptions = total_words = total_chars = 0
+            total_duration = 0.0
+            most_active_hour: int | None = None
+            most_active_day: str | None = None
+            top_apps: list[tuple[str, int]] = []
+            top_words: list[tuple[str, int]] = []
+            word_counter: Counter[str] = Counter()
             day_names = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
-            most_active_day = day_names[int(day_row[0])] if day_row else None
 
-            # Top apps
-            top_apps = conn.execute(
-                f"""
-                SELECT COALESCE(app_name, 'Unknown') as app, COUNT(*) as cnt
-                FROM transcriptions
-                WHERE {where_clause} AND app_name IS NOT NULL
-                GROUP BY app_name
-                ORDER BY cnt DESC
-                LIMIT 10
-                """,
-                params,
-            ).fetchall()
-
-            # Top words (from word_counts table for all-time, or calculate for period)
-            if since is None and until is None:
-                top_words = conn.execute(
-                    "SELECT word, count FROM word_counts ORDER BY count DESC LIMIT 50"
-                ).fetchall()
-            else:
-                # For specific period, we need to recalculate from transcriptions
-                texts = conn.execute(
-                    f"SELECT COALESCE(edited_text, raw_text) FROM transcriptions WHERE {where_clause}",
-                    params,
-                ).fetchall()
-                word_counter: Counter[str] = Counter()
-                for (text,) in texts:
-                    for word in text.split():
-                        word_lower = word.lower().strip(".,!?;:\"'()[]{}").strip()
-                        if len(word_lower) >= 3:
-                            word_counter[word_lower] += 1
+            for tag, key, value, extra1, extra2 in conn.execute(query, params):
+                if tag == "total":
+                    total_transcriptions, total_words, total_chars, total_duration = (
+                        key, value, extra1, extra2
+                    )
+                elif tag == "hour":
+                    most_active_hour = key
+                elif tag == "dow":
+                    most_active_day = day_names[key]
+                elif tag == "app":
+                    top_apps.append((key, value))
+                elif tag == "word":
+                    top_words.append((key, value))
+                else:
+                    word_counter.update(m.group(0).lower() for m in _WORD_RE.finditer(key))
+
+            if not all_time:
                 top_words = word_counter.most_common(50)
+            top_apps.sort(key=lambda app: app[1], reverse=True)
+            top_words.sort(key=lambda word: word[1], reverse=True)
+
+        # Estimated typing time (45 WPM average)
+        estimated_typing_time = (total_words / 45) * 60 if total_words > 0 else 0
+        time_saved = max(0, estimated_typing_time - total_duration)
+
+        avg_words = total_words / total_transcriptions if total_transcriptions > 0 else 0
 
         return Stats(
             total_transcriptions=total_transcriptions,
@@ -246,8 +435,8 @@ class TranscriptionDB:
             avg_words_per_transcription=avg_words,
             most_active_hour=most_active_hour,
             most_active_day=most_active_day,
-            top_apps=list(top_apps),
-            top_words=list(top_words),
+            top_apps=top_apps,
+            top_words=top_words,
         )
 
     def get_stats_today(self) -> Stats:
@@ -282,7 +471,9 @@ class TranscriptionDB:
 
     def get_recent(self, limit: int = 20) -> list[TranscriptionRecord]:
         """Get recent transcriptions."""
-        with sqlite3.connect(self.db_path) as conn:
+        self.flush()
+        with self._lock:
+            conn = self._conn
             rows = conn.execute(
                 """
                 SELECT id, timestamp, raw_text, edited_text, duration_seconds,
@@ -312,13 +503,18 @@ class TranscriptionDB:
 
     def get_daily_word_counts(self, days: int = 30) -> list[tuple[str, int]]:
         """Get word counts per day for the last N days."""
-        since = datetime.now() - timedelta(days=days)
-        with sqlite3.connect(self.db_path) as conn:
+        since = date.today() - timedelta(days=days)
+        return self._cached(("daily", since), lambda: self._query_daily_word_counts(since))
+
+    def _query_daily_word_counts(self, since: date) -> list[tuple[str, int]]:
+        """Compute word counts per day since a date."""
+        with self._lock:
+            conn = self._conn
             rows = conn.execute(
                 """
-                SELECT date(timestamp) as day, SUM(word_count) as words
+                SELECT day, SUM(word_count) as words
                 FROM transcriptions
-                WHERE timestamp >= ?
+                WHERE day >= ?
                 GROUP BY day
                 ORDER BY day
                 """,
@@ -326,6 +522,48 @@ class TranscriptionDB:
             ).fetchall()
         return list(rows)
 
+    def load_entries(self, table: str) -> dict[str, str]:
+        """Get all entries of a user-managed table, oldest first."""
+        key_column, value_column = self.ENTRY_TABLES[table]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {key_column}, {value_column} FROM {table} ORDER BY rowid"
+            ).fetchall()
+        return dict(rows)
+
+    def save_entries(self, table: str, entries: dict[str, str], replace: bool = False) -> None:
+        """Insert or update entries of a user-managed table in one transaction.
+
+        Args:
+            table: Table name, one of ENTRY_TABLES
+            entries: Values by key
+            replace: Delete all existing entries first
+        """
+        if not entries and not replace:
+            return
+        key_column, value_column = self.ENTRY_TABLES[table]
+        sql = (
+            f"INSERT INTO {table} ({key_column}, {value_column}) VALUES (?, ?) "
+            f"ON CONFLICT({key_column}) DO UPDATE SET {value_column} = excluded.{value_column}"
+        )
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                if replace:
+                    conn.execute(f"DELETE FROM {table}")
+                conn.executemany(sql, entries.items())
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def delete_entry(self, table: str, key: str) -> None:
+        """Delete one entry of a user-managed table."""
+        key_column, _ = self.ENTRY_TABLES[table]
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (key,))
+
     def format_stats(self, stats: Stats) -> str:
         """Format stats as a human-readable string."""
         lines = [
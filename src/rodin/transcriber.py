@@ -1,20 +1,50 @@
 """Speech-to-text transcription using Whisper."""
 
+import bisect
 import io
 import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from faster_whisper import WhisperModel
+import numpy as np
 
 from .config import WhisperConfig, get_config_dir
 
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
+
+# faster_whisper pulls in ctranslate2 and is slow to import, so it is loaded
+# on first use (normally by the background model-loading thread) rather than
+# when the UI imports this module.
+_faster_whisper = None
+
+
+def _get_whisper():
+    """Import faster_whisper on first use."""
+    global _faster_whisper
+    if _faster_whisper is None:
+        import faster_whisper as _faster_whisper
+    return _faster_whisper
+
 
 class Transcriber:
     """Transcribes audio using faster-whisper."""
 
+    # Sample rate Whisper models expect
+    SAMPLE_RATE = 16000
+
+    # Silence inserted between recordings in a batch, so words near the
+    # edges get timestamps clearly on one side of the boundary. The VAD
+    # stitches speech back into one stream, so this does not isolate them.
+    BATCH_GAP_SECONDS = 2.0
+
+    # Most audio transcribed in one model call by transcribe_batch()
+    MAX_BATCH_SECONDS = 300.0
+
     def __init__(self, config: WhisperConfig | None = None):
         self.config = config or WhisperConfig()
-        self._model: WhisperModel | None = None
+        self._model: "WhisperModel | None" = None
 
     def _get_model_dir(self) -> Path:
         """Get directory for storing Whisper models."""
@@ -81,7 +111,7 @@ class Transcriber:
 
         if local_path:
             print(f"Loading Whisper model '{self.config.model_size}' from local cache on {device}...")
-            self._model = WhisperModel(
+            self._model = _get_whisper().WhisperModel(
                 str(local_path),
                 device=device,
                 compute_type=compute_type,
@@ -101,11 +131,11 @@ class Transcriber:
                 f"Run: rodin --download-model {self.config.model_size}"
             )
 
-    def transcribe(self, audio_data: bytes) -> str:
+    def transcribe(self, audio_data: bytes | Path) -> str:
         """Transcribe audio data to text.
 
         Args:
-            audio_data: WAV audio data as bytes
+            audio_data: WAV audio data as bytes, or the path of a WAV file
 
         Returns:
             Transcribed text
@@ -113,34 +143,113 @@ class Transcriber:
         if self._model is None:
             self.load_model()
 
+        if isinstance(audio_data, Path):
+            return self._transcribe_file(str(audio_data))
+
         # Write audio to temporary file (faster-whisper needs a file path)
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
             tmp_file.write(audio_data)
             tmp_path = tmp_file.name
 
         try:
-            segments, info = self._model.transcribe(
-                tmp_path,
-                language=self.config.language,
-                beam_size=5,
-                vad_filter=True,  # Filter out silence
-                vad_parameters=dict(
-                    min_silence_duration_ms=500,
-                    speech_pad_ms=400,
-                ),
-            )
-
-            # Combine all segments
-            text_parts = []
-            for segment in segments:
-                text_parts.append(segment.text.strip())
-
-            return " ".join(text_parts)
-
+            return self._transcribe_file(tmp_path)
         finally:
             # Clean up temp file
             Path(tmp_path).unlink(missing_ok=True)
 
+    def transcribe_batch(self, paths: list[Path]) -> list[str]:
+        """Transcribe several WAV files with as few model calls as possible.
+
+        Recordings are joined with silence in between (up to
+        MAX_BATCH_SECONDS per call), transcribed with word timestamps, and
+        the words are split back by time. Batching needs at least two
+        recordings and a configured language, since one call detects a
+        single language for everything in it; otherwise each recording is
+        transcribed on its own.
+
+        Returns:
+            Transcribed text for each path, in order
+        """
+        if self._model is None:
+            self.load_model()
+
+        if len(paths) < 2 or not self.config.language:
+            return [self.transcribe(path) for path in paths]
+
+        decode_audio = _get_whisper().decode_audio
+        max_samples = int(self.MAX_BATCH_SECONDS * self.SAMPLE_RATE)
+
+        texts: list[str] = []
+        batch: list[np.ndarray] = []
+        batch_samples = 0
+        for path in paths:
+            audio = decode_audio(str(path), sampling_rate=self.SAMPLE_RATE)
+            if batch and batch_samples + len(audio) > max_samples:
+                texts.extend(self._transcribe_joined(batch))
+                batch, batch_samples = [], 0
+            batch.append(audio)
+            batch_samples += len(audio)
+        texts.extend(self._transcribe_joined(batch))
+        return texts
+
+    def _transcribe_joined(self, audios: list[np.ndarray]) -> list[str]:
+        """Transcribe recordings in one model call and split the words back."""
+        gap = np.zeros(int(self.BATCH_GAP_SECONDS * self.SAMPLE_RATE), dtype=np.float32)
+
+        # Words are assigned by their midpoint: anything before the middle of
+        # the gap after a recording belongs to that recording.
+        parts: list[np.ndarray] = []
+        boundaries: list[float] = []
+        offset = 0
+        for audio in audios:
+            if parts:
+                boundaries.append((offset + len(gap) / 2) / self.SAMPLE_RATE)
+                parts.append(gap)
+                offset += len(gap)
+            parts.append(audio)
+            offset += len(audio)
+
+        # Don't prompt one recording with the text of the one before it
+        segments = self._run_model(
+            np.concatenate(parts),
+            word_timestamps=True,
+            condition_on_previous_text=False,
+        )
+
+        words: list[list[str]] = [[] for _ in audios]
+        for segment in segments:
+            for word in segment.words or ():
+                midpoint = (word.start + word.end) / 2
+                words[bisect.bisect(boundaries, midpoint)].append(word.word)
+
+        return ["".join(recording_words).strip() for recording_words in words]
+
+    def _run_model(self, audio: "str | np.ndarray", **options):
+        """Run the model over a file or 16 kHz samples; returns the segments."""
+        segments, info = self._model.transcribe(
+            audio,
+            language=self.config.language,
+            beam_size=5,
+            vad_filter=True,  # Filter out silence
+            vad_parameters=dict(
+                min_silence_duration_ms=500,
+                speech_pad_ms=400,
+            ),
+            **options,
+        )
+        return segments
+
+    def _transcribe_file(self, path: str) -> str:
+        """Transcribe a WAV file to text."""
+        segments = self._run_model(path)
+
+        # Combine all segments
+        text_parts = []
+        for segment in segments:
+            text_parts.append(segment.text.strip())
+
+        return " ".join(text_parts)
+
     def unload_model(self) -> None:
         """Unload the model to free memory."""
         self._model = None
@@ -1,29 +1,123 @@
 """Text insertion at cursor position."""
 
+import functools
+import queue
 import sys
+import threading
 import time
+from concurrent.futures import Future
+from typing import Callable
 
 import pyperclip
 from pynput.keyboard import Controller, Key
 
+if sys.platform == "darwin":
+    from AppKit import NSPasteboard, NSPasteboardTypeString
+
+
+def _queued(method: Callable) -> Callable[..., Future]:
+    """Run a TextTyper method on the worker thread, after earlier requests.
+
+    The wrapped method returns a Future for the call's outcome.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "TextTyper", *args, **kwargs) -> Future:
+        return self._submit(method, self, *args, **kwargs)
+
+    return wrapper
+
 
 class TextTyper:
-    """Inserts text at the current cursor position."""
+    """Inserts text at the current cursor position.
 
-    def __init__(self, typing_delay: float = 0.01):
+    Text insertion and every other key operation run on one worker thread,
+    so callers (including the AppKit main thread) never block on the
+    clipboard or keyboard, and keys always land in the order they were
+    requested. Each call returns a Future; use flush() to wait for all of
+    them.
+    """
+
+    # Upper bound on waiting for a clipboard write to become visible
+    CLIPBOARD_TIMEOUT = 0.02
+
+    def __init__(
+        self,
+        typing_delay: float = 0.0,
+        paste_delay: float = 0.0,
+        restore_delay: float = 0.1,
+    ):
+        """
+        Args:
+            typing_delay: Seconds to wait between typed characters. Only
+                needed for targets that drop fast key events.
+            paste_delay: Extra seconds to wait before pasting, for slow targets
+            restore_delay: Seconds to wait before restoring the clipboard,
+                giving the target app time to read the pasted text
+        """
         self.keyboard = Controller()
         self.typing_delay = typing_delay
+        self.paste_delay = paste_delay
+        self.restore_delay = restore_delay
+
+        # The clipboard is restored in the background; a paste that lands
+        # before the restore reuses the saved content instead of reading back
+        # its own text.
+        self._clipboard_lock = threading.Lock()
+        self._restore_timer: threading.Timer | None = None
+        self._saved_clipboard: str | None = None
+        self._pasted_change_count: int | None = None
 
-    def type_text(self, text: str, method: str = "auto") -> None:
+        self._queue: queue.Queue[tuple[Callable, tuple, dict, Future]] = queue.Queue()
+        self._worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker_thread.start()
+
+    def type_text(self, text: str, method: str = "auto") -> Future:
         """Type text at the current cursor position.
 
+        Returns immediately; the text is inserted on the worker thread.
+
         Args:
             text: Text to type
             method: Insertion method - "type", "paste", or "auto"
+
+        Returns:
+            A Future that completes once the text is inserted, or holds the
+            exception if insertion failed
         """
         if not text:
-            return
+            done: Future = Future()
+            done.set_result(None)
+            return done
+
+        return self._submit(self._insert_text, text, method)
+
+    def flush(self) -> None:
+        """Block until all queued operations have run."""
+        if self._worker_thread.is_alive():
+            self._queue.join()
 
+    def _submit(self, func: Callable, *args, **kwargs) -> Future:
+        """Queue a call for the worker thread."""
+        future: Future = Future()
+        self._queue.put((func, args, kwargs, future))
+        return future
+
+    def _worker_loop(self) -> None:
+        """Run queued operations, one at a time."""
+        while True:
+            func, args, kwargs, future = self._queue.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    future.set_result(func(*args, **kwargs))
+            except Exception as e:
+                print(f"Error sending keys: {e}")
+                future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def _insert_text(self, text: str, method: str) -> None:
+        """Insert text with the given method."""
         if method == "auto":
             # Use paste for longer text (faster), type for short text
             method = "paste" if len(text) > 50 else "type"
@@ -34,43 +128,123 @@ class TextTyper:
             self._type_text(text)
 
     def _type_text(self, text: str) -> None:
-        """Type text character by character."""
+        """Type text as key events.
+
+        Without a typing delay the whole string goes to pynput in one call;
+        otherwise it is typed character by character.
+        """
+        delay = self.typing_delay
+        if delay <= 0:
+            self.keyboard.type(text)
+            return
+
         for char in text:
             self.keyboard.type(char)
-            if self.typing_delay > 0:
-                time.sleep(self.typing_delay)
+            time.sleep(delay)
 
     def _paste_text(self, text: str) -> None:
-        """Paste text using clipboard."""
-        # Save current clipboard content
-        try:
-            original_clipboard = pyperclip.paste()
-        except Exception:
-            original_clipboard = None
-
-        try:
-            # Copy text to clipboard
-            pyperclip.copy(text)
-
-            # Small delay to ensure clipboard is ready
-            time.sleep(0.05)
-
-            # Paste using keyboard shortcut
-            modifier = Key.cmd if sys.platform == "darwin" else Key.ctrl
-            with self.keyboard.pressed(modifier):
-                self.keyboard.tap("v")
+        """Paste text using clipboard.
+
+        Returns once the paste keystroke is sent; the original clipboard
+        content is restored after restore_delay on a timer thread.
+        """
+        with self._clipboard_lock:
+            pending_restore = self._restore_timer is not None
+            if pending_restore:
+                self._restore_timer.cancel()
+                self._restore_timer = None
+
+            # If a restore is still pending and nothing else has written to
+            # the clipboard, it holds our own text; keep the content saved by
+            # the earlier paste. Otherwise save current clipboard content.
+            if not (pending_restore and self._clipboard_unchanged()):
+                try:
+                    self._saved_clipboard = self._get_clipboard()
+                except Exception:
+                    self._saved_clipboard = None
 
-            # Small delay before restoring clipboard
-            time.sleep(0.1)
+            try:
+                # Copy text to clipboard. NSPasteboard writes are synchronous;
+                # elsewhere, wait until the write is visible.
+                self._pasted_change_count = self._set_clipboard(text)
+                if self._pasted_change_count is None:
+                    self._wait_for_clipboard(text)
+                if self.paste_delay > 0:
+                    time.sleep(self.paste_delay)
 
-        finally:
-            # Restore original clipboard content
-            if original_clipboard is not None:
+                # Paste using keyboard shortcut
+                modifier = Key.cmd if sys.platform == "darwin" else Key.ctrl
+                with self.keyboard.pressed(modifier):
+                    self.keyboard.tap("v")
+            finally:
+                # Restore original clipboard content once the paste has landed
+                timer = threading.Timer(self.restore_delay, self._restore_clipboard)
+                timer.daemon = True
+                self._restore_timer = timer
+                timer.start()
+
+    def _restore_clipboard(self) -> None:
+        """Put back the clipboard content saved before pasting."""
+        with self._clipboard_lock:
+            # A later paste may have replaced this timer while it was waiting
+            if self._restore_timer is not threading.current_thread():
+                return
+            self._restore_timer = None
+            original_clipboard, self._saved_clipboard = self._saved_clipboard, None
+
+            # Leave the clipboard alone if something else has written to it
+            if original_clipboard is not None and self._clipboard_unchanged():
                 try:
-                    pyperclip.copy(original_clipboard)
+                    self._set_clipboard(original_clipboard)
                 except Exception:
                     pass
 
+    def _get_clipboard(self) -> str | None:
+        """Read the clipboard text.
+
+        On macOS the pasteboard is read directly; pyperclip would spawn
+        pbpaste for every call.
+        """
+        if sys.platform == "darwin":
+            return NSPasteboard.generalPasteboard().stringForType_(NSPasteboardTypeString)
+        return pyperclip.paste()
+
+    def _set_clipboard(self, text: str) -> int | None:
+        """Replace the clipboard content with text.
+
+        Returns:
+            The pasteboard change count after the write on macOS, else None
+        """
+        if sys.platform == "darwin":
+            pasteboard = NSPasteboard.generalPasteboard()
+            pasteboard.clearContents()
+            pasteboard.setString_forType_(text, NSPasteboardTypeString)
+            return pasteboard.changeCount()
+        pyperclip.copy(text)
+        return None
+
+    def _clipboard_unchanged(self) -> bool:
+        """Check that nothing has written to the clipboard since our last paste.
+
+        Uses the pasteboard change count on macOS; elsewhere there is no
+        cheap way to tell, so the clipboard is assumed unchanged.
+        """
+        if self._pasted_change_count is None:
+            return True
+        return NSPasteboard.generalPasteboard().changeCount() == self._pasted_change_count
+
+    def _wait_for_clipboard(self, text: str) -> None:
+        """Poll until a clipboard write is visible, up to CLIPBOARD_TIMEOUT."""
+        deadline = time.monotonic() + self.CLIPBOARD_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                if pyperclip.paste() == text:
+                    return
+            except Exception:
+                return
+            time.sleep(0.001)
+
+    @_queued
     def press_key(self, key: Key | str) -> None:
         """Press a single key."""
         if isinstance(key, str):
@@ -78,42 +252,59 @@ class TextTyper:
         else:
             self.keyboard.tap(key)
 
-    def press_enter(self) -> None:
-        """Press Enter key."""
-        self.keyboard.tap(Key.enter)
+    @_queued
+    def press_enter(self, count: int = 1) -> None:
+        """Press Enter key.
+
+        Args:
+            count: Number of times to press it
+        """
+        for _ in range(count):
+            self.keyboard.tap(Key.enter)
 
+    @_queued
     def press_tab(self) -> None:
         """Press Tab key."""
         self.keyboard.tap(Key.tab)
 
-    def delete_chars(self, count: int = 1) -> None:
+    @_queued
+    def delete_chars(self, count: int = 1, delay: float = 0.0) -> None:
         """Delete characters using backspace.
 
         Args:
             count: Number of characters to delete
+            delay: Seconds to wait between backspaces, for targets that
+                drop fast key events
         """
         for _ in range(count):
             self.keyboard.tap(Key.backspace)
-            time.sleep(0.01)
+            if delay > 0:
+                time.sleep(delay)
 
-    def delete_words(self, count: int = 1) -> None:
+    @_queued
+    def delete_words(self, count: int = 1, delay: float = 0.0) -> None:
         """Delete words using Option+Backspace (Mac) or Ctrl+Backspace (Windows).
 
         Args:
             count: Number of words to delete
+            delay: Seconds to wait between deletions, for targets that
+                drop fast key events
         """
         modifier = Key.alt if sys.platform == "darwin" else Key.ctrl
         for _ in range(count):
             with self.keyboard.pressed(modifier):
                 self.keyboard.tap(Key.backspace)
-            time.sleep(0.02)
+            if delay > 0:
+                time.sleep(delay)
 
+    @_queued
     def undo(self) -> None:
         """Perform undo (Cmd+Z / Ctrl+Z)."""
         modifier = Key.cmd if sys.platform == "darwin" else Key.ctrl
         with self.keyboard.pressed(modifier):
             self.keyboard.tap("z")
 
+    @_queued
     def redo(self) -> None:
         """Perform redo (Cmd+Shift+Z / Ctrl+Y)."""
         if sys.platform == "darwin":
@@ -124,24 +315,28 @@ class TextTyper:
             with self.keyboard.pressed(Key.ctrl):
                 self.keyboard.tap("y")
 
+    @_queued
     def select_all(self) -> None:
         """Select all text (Cmd+A / Ctrl+A)."""
         modifier = Key.cmd if sys.platform == "darwin" else Key.ctrl
         with self.keyboard.pressed(modifier):
             self.keyboard.tap("a")
 
+    @_queued
     def copy(self) -> None:
         """Copy selection (Cmd+C / Ctrl+C)."""
         modifier = Key.cmd if sys.platform == "darwin" else Key.ctrl
         with self.keyboard.pressed(modifier):
             self.keyboard.tap("c")
 
+    @_queued
     def cut(self) -> None:
         """Cut selection (Cmd+X / Ctrl+X)."""
         modifier = Key.cmd if sys.platform == "darwin" else Key.ctrl
         with self.keyboard.pressed(modifier):
             self.keyboard.tap("x")
 
+    @_queued
     def paste(self) -> None:
         """Paste from clipboard (Cmd+V / Ctrl+V)."""
         modifier = Key.cmd if sys.platform == "darwin" else Key.ctrl
@@ -207,8 +207,8 @@ class WhisperFlowApp(rumps.App):
                 )
                 print(f"Edited: {text}")
 
-            # Type the text
-            self.typer.type_text(text)
+            # Type the text, waiting so a failure still shows the error notification
+            self.typer.type_text(text).result()
 
         except Exception as e:
             print(f"Error processing recording: {e}")
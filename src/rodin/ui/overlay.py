@@ -3,6 +3,9 @@
 import sys
 import threading
 import time
+import traceback
+from concurrent.futures import Future
+from functools import partial
 
 if sys.platform != "darwin":
     raise ImportError("Overlay UI only available on macOS")
@@ -11,18 +14,21 @@ import objc
 from AppKit import (
     NSApplication,
     NSApplicationActivationPolicyAccessory,
+    NSAttributedString,
     NSBackingStoreBuffered,
     NSBezierPath,
     NSColor,
     NSFont,
     NSFontAttributeName,
     NSForegroundColorAttributeName,
+    NSMakePoint,
     NSMakeRect,
     NSScreen,
     NSView,
     NSWindow,
     NSWindowStyleMaskBorderless,
     NSStatusWindowLevel,
+    NSTimer,
     NSTrackingArea,
     NSTrackingMouseEnteredAndExited,
     NSTrackingActiveAlways,
@@ -37,6 +43,7 @@ from ..dictionary import PersonalDictionary
 from ..editor import create_editor
 from ..hotkey import HotkeyHandler
 from ..recorder import AudioRecorder
+from ..rewriter import TextRewriter
 from ..snippets import SnippetExpander
 from ..sounds import play_start_sound, play_stop_sound, play_error_sound
 from ..stats import get_db
@@ -46,7 +53,13 @@ from ..voice_commands import VoiceCommandProcessor
 
 
 class MicButtonView(NSView):
-    """Custom view for the microphone button."""
+    """Custom view for the microphone button.
+
+    Everything drawn that doesn't depend on the pulse animation (the circle
+    path, colors and icon glyphs) is built once in initWithFrame_.
+    """
+
+    ICONS = ("🎤", "🔴", "⏳")
 
     def initWithFrame_(self, frame):
         self = objc.super(MicButtonView, self).initWithFrame_(frame)
@@ -58,6 +71,7 @@ class MicButtonView(NSView):
         self._is_hovering = False
         self._audio_level = 0.0
         self._on_click = None
+        self._pulse_timer = None
 
         # Set up tracking area for hover
         tracking_area = NSTrackingArea.alloc().initWithRect_options_owner_userInfo_(
@@ -68,14 +82,38 @@ class MicButtonView(NSView):
         )
         self.addTrackingArea_(tracking_area)
 
+        # Background circle; the view is never resized
+        bounds = self.bounds()
+        circle_rect = NSMakeRect(2, 2, bounds.size.width - 4, bounds.size.height - 4)
+        self._circle_path = NSBezierPath.bezierPathWithOvalInRect_(circle_rect)
+        self._circle_path.setLineWidth_(1.5)
+
+        # Colors for the non-recording states; recording pulses per frame
+        self._fill_colors = {
+            "processing": NSColor.colorWithRed_green_blue_alpha_(0.9, 0.6, 0.2, 0.95),
+            "hovering": NSColor.colorWithRed_green_blue_alpha_(0.3, 0.3, 0.35, 0.95),
+            "idle": NSColor.colorWithRed_green_blue_alpha_(0.2, 0.2, 0.25, 0.9),
+        }
+        self._border_color = NSColor.colorWithRed_green_blue_alpha_(0.4, 0.4, 0.45, 1.0)
+
+        # Icons with their centered drawing points
+        attrs = {
+            NSFontAttributeName: NSFont.systemFontOfSize_(24),
+            NSForegroundColorAttributeName: NSColor.whiteColor(),
+        }
+        self._glyphs = {}
+        for icon in self.ICONS:
+            glyph = NSAttributedString.alloc().initWithString_attributes_(icon, attrs)
+            icon_size = glyph.size()
+            x = (bounds.size.width - icon_size.width) / 2
+            y = (bounds.size.height - icon_size.height) / 2
+            self._glyphs[icon] = (glyph, NSMakePoint(x, y))
+
         return self
 
     def drawRect_(self, rect):
         """Draw the button."""
-        # Background circle
-        bounds = self.bounds()
-        circle_rect = NSMakeRect(2, 2, bounds.size.width - 4, bounds.size.height - 4)
-        path = NSBezierPath.bezierPathWithOvalInRect_(circle_rect)
+        path = self._circle_path
 
         # Colors based on state
         if self._is_recording:
@@ -84,19 +122,18 @@ class MicButtonView(NSView):
             NSColor.colorWithRed_green_blue_alpha_(0.9 * pulse, 0.2, 0.2, 0.95).setFill()
         elif self._is_processing:
             # Orange when processing
-            NSColor.colorWithRed_green_blue_alpha_(0.9, 0.6, 0.2, 0.95).setFill()
+            self._fill_colors["processing"].setFill()
         elif self._is_hovering:
             # Lighter when hovering
-            NSColor.colorWithRed_green_blue_alpha_(0.3, 0.3, 0.35, 0.95).setFill()
+            self._fill_colors["hovering"].setFill()
         else:
             # Dark gray default
-            NSColor.colorWithRed_green_blue_alpha_(0.2, 0.2, 0.25, 0.9).setFill()
+            self._fill_colors["idle"].setFill()
 
         path.fill()
 
         # Border
-        NSColor.colorWithRed_green_blue_alpha_(0.4, 0.4, 0.45, 1.0).setStroke()
-        path.setLineWidth_(1.5)
+        self._border_color.setStroke()
         path.stroke()
 
         # Mic icon (simple text emoji for now)
@@ -104,19 +141,8 @@ class MicButtonView(NSView):
         if self._is_processing:
             icon = "⏳"
 
-        attrs = {
-            NSFontAttributeName: NSFont.systemFontOfSize_(24),
-            NSForegroundColorAttributeName: NSColor.whiteColor(),
-        }
-        icon_size = icon.sizeWithAttributes_(attrs) if hasattr(icon, 'sizeWithAttributes_') else (24, 24)
-
-        # Center the icon
-        from Foundation import NSString, NSMakePoint
-        ns_icon = NSString.stringWithString_(icon)
-        icon_size = ns_icon.sizeWithAttributes_(attrs)
-        x = (bounds.size.width - icon_size.width) / 2
-        y = (bounds.size.height - icon_size.height) / 2
-        ns_icon.drawAtPoint_withAttributes_(NSMakePoint(x, y), attrs)
+        glyph, point = self._glyphs[icon]
+        glyph.drawAtPoint_(point)
 
     def acceptsFirstMouse_(self, event):
         """Accept clicks even when window is not key."""
@@ -148,6 +174,19 @@ class MicButtonView(NSView):
     def setOnClick_(self, callback):
         self._on_click = callback
 
+    def startPulse(self):
+        """Redraw every 100ms while recording. Must run on the main thread."""
+        if self._pulse_timer is None:
+            schedule = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_
+            self._pulse_timer = schedule(0.1, self, "pulse:", None, True)
+
+    def pulse_(self, timer):
+        """Animation tick; stops the timer once recording ends."""
+        if not self._is_recording:
+            timer.invalidate()
+            self._pulse_timer = None
+        self.setNeedsDisplay_(True)
+
 
 
 
@@ -172,6 +211,7 @@ class OverlayWindow:
         # New feature components
         self.dictionary = PersonalDictionary()
         self.snippets = SnippetExpander()
+        self.rewriter = TextRewriter(self.dictionary, self.snippets)
         self.voice_commands = VoiceCommandProcessor()
         self.app_context = AppContextManager(self.settings.app_context.app_presets)
 
@@ -293,59 +333,88 @@ class OverlayWindow:
         7. Type the text at cursor
         8. Record stats
         """
-        import time as _time
-        start_time = _time.time()
+        start_time = time.time()
+
+        # Snapshot the settings used below
+        settings = self.settings
+        dictionary_enabled = settings.dictionary.enabled
+        snippets_enabled = settings.snippets.enabled
+        ai_editor_enabled = settings.ai_editor.enabled
+        voice_commands_enabled = settings.voice_commands.enabled
+        auto_learn = settings.dictionary.auto_learn
+        default_preset = settings.ai_editor.preset
 
         # Get app context captured at recording start
         context = self._current_app_context
         app_bundle_id = context.get("bundle_id") if context else None
         app_name = context.get("name") if context else None
-        preset = context.get("preset", self.settings.ai_editor.preset) if context else self.settings.ai_editor.preset
+        preset = context.get("preset", default_preset) if context else default_preset
 
         pending_recording = None
 
         try:
-            audio_data = self.recorder.stop()
+            samples = self.recorder.stop_samples()
 
-            if not audio_data:
+            if samples.size == 0:
                 print("No audio recorded")
                 return
 
             # 1. Save to queue immediately (resilient storage)
             pending_recording = self.audio_queue.save_recording(
-                audio_data=audio_data,
+                samples=samples,
+                samplerate=settings.audio.sample_rate,
                 app_bundle_id=app_bundle_id,
                 app_name=app_name,
                 preset=preset,
             )
             print(f"Audio saved: {pending_recording.id}")
 
-            # 2. Transcribe
-            text = self.transcriber.transcribe(audio_data)
+            # 2. Transcribe straight from the saved file
+            text = self.transcriber.transcribe(pending_recording.audio_path)
 
             if not text:
                 print("No speech detected")
                 # Keep the recording in case user wants to retry
+                self.audio_queue.release(pending_recording)
                 return
 
             raw_text = text
             print(f"Transcribed: {text}")
 
+            # With no AI editing in between, dictionary corrections and
+            # snippet expansion are applied together in one pass, as long as
+            # the entries allow it
+            fused = (
+                dictionary_enabled
+                and snippets_enabled
+                and not ai_editor_enabled
+                and self.rewriter.fusable()
+            )
+            fired: list[tuple[str, str]] = []
+
             # 3. Apply personal dictionary corrections
-            if self.settings.dictionary.enabled:
+            if fused:
+                text, fired = self.rewriter.apply(text)
+                if fired:
+                    print(f"Rewritten: {text[:50]}...")
+            elif dictionary_enabled:
                 text = self.dictionary.apply(text)
                 if text != raw_text:
                     print(f"Dictionary: {text}")
 
             # 4. Check for voice commands
-            if self.settings.voice_commands.enabled:
-                command, remaining_text = self.voice_commands.detect_command(text)
+            if voice_commands_enabled:
+                command_text = text
+                if any(kind == "snippet" for kind, _ in fired):
+                    # Commands are matched before snippets expand
+                    command_text = self.dictionary.apply(raw_text)
+                command, remaining_text = self.voice_commands.detect_command(command_text)
                 if command:
                     print(f"Voice command: {command[0]}")
                     self.voice_commands.execute_command(command, self.typer)
                     if not remaining_text:
                         # Pure command, no text to process - still record it
-                        duration = _time.time() - start_time
+                        duration = time.time() - start_time
                         self.stats_db.record(
                             raw_text=raw_text,
                             edited_text=f"[Command: {command[0]}]",
@@ -361,31 +430,32 @@ class OverlayWindow:
                     text = remaining_text
 
             # 5. AI editing (use preset from context)
-            if self.settings.ai_editor.enabled and preset != "default":
-                print(f"AI editing with preset: {preset}")
-            if self.settings.ai_editor.enabled:
+            if ai_editor_enabled:
+                if preset != "default":
+                    print(f"AI editing with preset: {preset}")
                 text = self.editor.edit(text, preset=preset)
                 print(f"Edited: {text}")
 
             # 6. Snippet expansion
-            if self.settings.snippets.enabled:
+            if snippets_enabled and not fused:
                 expanded = self.snippets.expand(text)
                 if expanded != text:
                     text = expanded
                     print(f"Snippet: {text[:50]}...")
 
             # 7. Type the text
-            self.typer.type_text(text)
+            insertion = self.typer.type_text(text)
 
             # Track for "delete that" command
             self.voice_commands.set_last_typed_length(len(text))
 
-            # Auto-learn from corrections if enabled
-            if self.settings.dictionary.auto_learn and text != raw_text:
+            # Auto-learn from corrections if enabled; a fused rewrite only
+            # applied existing entries, so there is nothing new to learn
+            if auto_learn and text != raw_text and not fused:
                 self.dictionary.learn_from_correction(raw_text, text)
 
             # 8. Record stats
-            duration = _time.time() - start_time
+            duration = time.time() - start_time
             self.stats_db.record(
                 raw_text=raw_text,
                 edited_text=text if text != raw_text else None,
@@ -395,72 +465,103 @@ class OverlayWindow:
                 preset_used=preset,
             )
 
-            # Mark recording as successfully processed (delete from queue)
+            # Mark recording as processed (delete from queue) once the text
+            # is actually inserted; if insertion fails it is kept for retry
             if pending_recording:
-                self.audio_queue.mark_completed(pending_recording)
+                insertion.add_done_callback(partial(self._finish_insertion, pending_recording))
 
             print(f"Done in {duration:.1f}s")
 
         except Exception as e:
             print(f"Error: {e}")
-            import traceback
             traceback.print_exc()
             # Audio is safely in queue - will be retried later
             if pending_recording:
                 print(f"Recording saved for retry: {pending_recording.id}")
+                self.audio_queue.release(pending_recording)
         finally:
             self._is_processing = False
             # Update UI on main thread
             AppHelper.callAfter(lambda: self.button_view.setProcessing_(False))
 
     def _schedule_refresh(self):
-        """Schedule UI refresh for recording animation."""
-        if self._is_recording:
-            self.button_view.setNeedsDisplay_(True)
-            # Refresh every 100ms for animation
-            AppHelper.callLater(0.1, self._schedule_refresh)
-
-    def _process_pending_recording(self, recording: PendingRecording, audio_data: bytes) -> bool:
-        """Process a single pending recording. Returns True if successful."""
-        try:
-            text = self.transcriber.transcribe(audio_data)
-            if not text:
-                return True  # No speech - consider it processed
-
-            raw_text = text
-
-            # Apply dictionary
-            if self.settings.dictionary.enabled:
-                text = self.dictionary.apply(text)
-
-            # AI editing
-            preset = recording.preset or self.settings.ai_editor.preset
-            if self.settings.ai_editor.enabled:
-                text = self.editor.edit(text, preset=preset)
-
-            # Snippet expansion
-            if self.settings.snippets.enabled:
-                text = self.snippets.expand(text)
+        """Start the recording animation.
 
-            # Calculate approximate duration from file size (16kHz, 16-bit mono)
-            duration = len(audio_data) / (16000 * 2)
+        The hotkey calls in from its own thread, so the repeating timer is
+        set up on the main run loop.
+        """
+        AppHelper.callAfter(self.button_view.startPulse)
 
-            # Record to stats
-            self.stats_db.record(
-                raw_text=raw_text,
-                edited_text=text if text != raw_text else None,
-                duration_seconds=duration,
-                app_bundle_id=recording.app_bundle_id,
-                app_name=recording.app_name,
-                preset_used=preset,
-            )
+    def _finish_insertion(self, recording: PendingRecording, insertion: Future) -> None:
+        """Complete a recording once its text is inserted, or hand it back for retry."""
+        if insertion.exception() is None:
+            self.audio_queue.mark_completed(recording)
+        else:
+            print(f"Recording saved for retry: {recording.id}")
+            self.audio_queue.release(recording)
 
-            print(f"Processed pending: {recording.id} -> {text[:50]}...")
-            return True
+    def _process_pending_batch(self, recordings: list[PendingRecording]) -> list[bool]:
+        """Transcribe pending recordings together. Returns a success flag for each."""
+        try:
+            texts = self.transcriber.transcribe_batch([r.audio_path for r in recordings])
+        except Exception:
+            if len(recordings) == 1:
+                raise
+            # Retry one at a time so a bad file doesn't hold back the rest
+            results = []
+            for recording in recordings:
+                try:
+                    results.extend(self._process_pending_batch([recording]))
+                except Exception as e:
+                    print(f"Failed to process {recording.id}: {e}")
+                    results.append(False)
+            return results
+
+        results = []
+        for recording, text in zip(recordings, texts):
+            try:
+                duration = recording.audio_path.stat().st_size / (16000 * 2)
+                self._finish_pending_recording(recording, text, duration)
+                results.append(True)
+            except Exception as e:
+                print(f"Failed to process {recording.id}: {e}")
+                results.append(False)
+        return results
+
+    def _finish_pending_recording(
+        self, recording: PendingRecording, text: str, duration: float
+    ) -> None:
+        """Edit and record the transcription of a pending recording."""
+        if not text:
+            return  # No speech - consider it processed
+
+        raw_text = text
+        settings = self.settings
+
+        # Apply dictionary
+        if settings.dictionary.enabled:
+            text = self.dictionary.apply(text)
+
+        # AI editing
+        preset = recording.preset or settings.ai_editor.preset
+        if settings.ai_editor.enabled:
+            text = self.editor.edit(text, preset=preset)
+
+        # Snippet expansion
+        if settings.snippets.enabled:
+            text = self.snippets.expand(text)
+
+        # Record to stats
+        self.stats_db.record(
+            raw_text=raw_text,
+            edited_text=text if text != raw_text else None,
+            duration_seconds=duration,
+            app_bundle_id=recording.app_bundle_id,
+            app_name=recording.app_name,
+            preset_used=preset,
+        )
 
-        except Exception as e:
-            print(f"Failed to process {recording.id}: {e}")
-            return False
+        print(f"Processed pending: {recording.id} -> {text[:50]}...")
 
     def run(self):
         """Run the overlay."""
@@ -488,7 +589,7 @@ class OverlayWindow:
             # Process any pending recordings after model loads
             if pending_count > 0:
                 print("Processing pending recordings...")
-                processed = self.audio_queue.process_pending(self._process_pending_recording)
+                processed = self.audio_queue.process_pending(self._process_pending_batch)
                 if processed > 0:
                     print(f"Processed {processed} pending recording(s)")
 
@@ -496,13 +597,12 @@ class OverlayWindow:
 
         # Start background processor for any future failures (checks every 60s)
         self.audio_queue.start_background_processor(
-            self._process_pending_recording,
+            self._process_pending_batch,
             interval_seconds=60.0,
         )
 
         # Start hotkey listener in a separate thread to avoid event loop conflict
         def start_hotkey():
-            import time
             time.sleep(1)  # Wait for event loop to start
             self.hotkey_handler.start()
         threading.Thread(target=start_hotkey, daemon=True).start()
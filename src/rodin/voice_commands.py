@@ -1,51 +1,154 @@
 """Voice command processing for hands-free editing."""
 
-import re
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from .typer import TextTyper
 
 
-# Command patterns and their actions
-# Format: (regex pattern, action_name, action_arg)
+# Command phrases and their actions
+# Format: (phrase template, action_name, action_arg)
+# Actions that repeat (delete_words, backspace, newline, tab) always carry
+# their count as action_arg, so execution never has to fill in a default.
+# In a template, "a|b" matches either word, "[word]" is optional, and
+# "{n}" matches a number, which becomes the action arg.
 VOICE_COMMANDS = [
     # Deletion commands
-    (r"^(?:delete|scratch|cancel)\s+that\.?$", "delete_last", None),
-    (r"^(?:delete|remove)\s+(?:the\s+)?last\s+word\.?$", "delete_words", 1),
-    (r"^(?:delete|remove)\s+(?:the\s+)?last\s+(\d+)\s+words?\.?$", "delete_words", "match"),
-    (r"^(?:backspace|back\s+space)\.?$", "backspace", 1),
-    (r"^undo(?:\s+that)?\.?$", "undo", None),
+    ("delete|scratch|cancel that", "delete_last", None),
+    ("delete|remove [the] last word", "delete_words", 1),
+    ("delete|remove [the] last {n} word|words", "delete_words", None),
+    ("backspace", "backspace", 1),
+    ("back space", "backspace", 1),
+    ("undo [that]", "undo", None),
 
     # Navigation/formatting commands
-    (r"^new\s+line\.?$", "newline", 1),
-    (r"^new\s+paragraph\.?$", "newline", 2),
-    (r"^(?:press\s+)?enter\.?$", "newline", 1),
-    (r"^(?:press\s+)?tab\.?$", "tab", 1),
+    ("new line", "newline", 1),
+    ("new paragraph", "newline", 2),
+    ("[press] enter", "newline", 1),
+    ("[press] tab", "tab", 1),
 
     # Selection commands (for future use)
-    (r"^select\s+all\.?$", "select_all", None),
-    (r"^copy(?:\s+that)?\.?$", "copy", None),
-    (r"^paste\.?$", "paste", None),
-    (r"^cut(?:\s+that)?\.?$", "cut", None),
+    ("select all", "select_all", None),
+    ("copy [that]", "copy", None),
+    ("paste", "paste", None),
+    ("cut [that]", "cut", None),
 ]
 
 
+def _expand_template(template: str) -> list[str]:
+    """List every phrase a command template matches."""
+    phrases = [""]
+    for token in template.split():
+        optional = token.startswith("[")
+        words = token.strip("[]").split("|")
+        expanded = [f"{phrase} {word}" for phrase in phrases for word in words]
+        phrases = expanded + phrases if optional else expanded
+    return [phrase.strip() for phrase in phrases]
+
+
+# Trie edge keys that can never be a whitespace-split token
+_NUMBER = 0
+_COMMAND = None
+
+# Longest number a "{n}" slot accepts
+MAX_NUMBER_DIGITS = 3
+
+
+def _build_trie() -> dict:
+    """Build a token trie over every phrase the commands accept.
+
+    Each node maps a word to the next node. A node also maps _NUMBER to the
+    node after a "{n}" slot, and _COMMAND to (action_name, action_arg) when
+    a phrase ends there.
+    """
+    trie: dict = {}
+    for template, action, arg in VOICE_COMMANDS:
+        for phrase in _expand_template(template):
+            node = trie
+            for word in phrase.split():
+                node = node.setdefault(_NUMBER if word == "{n}" else word, {})
+            node[_COMMAND] = (action, arg)
+    return trie
+
+
+COMMAND_TRIE = _build_trie()
+
+# Every command starts with one of these words
+COMMAND_PREFIXES = tuple(word for word in COMMAND_TRIE if isinstance(word, str))
+
+# Longest utterance worth walking the trie for, leaving room for stray
+# spaces and the trailing period
+MAX_COMMAND_LENGTH = max(
+    len(phrase)
+    for template, _, _ in VOICE_COMMANDS
+    for phrase in _expand_template(template)
+) + MAX_NUMBER_DIGITS + 5
+
+
+@lru_cache(maxsize=512)
+def _match_command(text: str) -> tuple[str, Any] | None:
+    """Match stripped, lowercased text against COMMAND_TRIE.
+
+    Cached because the same short utterances ("new line", "delete that")
+    come up again and again.
+    """
+    # The whole utterance must be a command, with any spacing and at most
+    # one trailing period
+    key = text[:-1] if text.endswith(".") else text
+
+    node = COMMAND_TRIE
+    number = None
+    for word in key.split():
+        next_node = node.get(word)
+        if next_node is None:
+            if (
+                _NUMBER not in node
+                or len(word) > MAX_NUMBER_DIGITS
+                or not word.isdecimal()
+            ):
+                return None
+            next_node = node[_NUMBER]
+            number = int(word)
+        node = next_node
+
+    command = node.get(_COMMAND)
+    if command is not None and number is not None:
+        return command[0], number
+    return command
+
+
 class VoiceCommandProcessor:
-    """Processes voice commands for text editing operations."""
+    """Processes voice commands for text editing operations.
+
+    Phrases are matched by walking COMMAND_TRIE one word at a time, so
+    ordinary dictation usually stops after a single dict miss.
+    """
+
+    # Action name -> handler(processor, typer, action_arg), shared by all
+    # instances
+    _dispatch = MappingProxyType({
+        "delete_last": lambda self, typer, arg: self._delete_last(typer),
+        "delete_words": lambda self, typer, arg: typer.delete_words(arg),
+        "backspace": lambda self, typer, arg: typer.delete_chars(arg),
+        "undo": lambda self, typer, arg: typer.undo(),
+        "newline": lambda self, typer, arg: typer.press_enter(arg),
+        "tab": lambda self, typer, arg: typer.press_tab(),
+        "select_all": lambda self, typer, arg: typer.select_all(),
+        "copy": lambda self, typer, arg: typer.copy(),
+        "paste": lambda self, typer, arg: typer.paste(),
+        "cut": lambda self, typer, arg: typer.cut(),
+    })
 
     def __init__(self):
-        self._compiled_patterns = [
-            (re.compile(pattern, re.IGNORECASE), action, arg)
-            for pattern, action, arg in VOICE_COMMANDS
-        ]
         self._last_typed_length = 0  # Track length of last typed text for "delete that"
 
     def set_last_typed_length(self, length: int) -> None:
         """Record the length of the last typed text for 'delete that' command."""
         self._last_typed_length = length
 
-    def detect_command(self, text: str) -> tuple[tuple[str, any] | None, str]:
+    def detect_command(self, text: str) -> tuple[tuple[str, Any] | None, str]:
         """Detect if text contains a voice command.
 
         Args:
@@ -57,23 +160,24 @@ class VoiceCommandProcessor:
             remaining_text is any text after the command, or the original
             text if no command was found.
         """
-        text = text.strip()
-
-        for pattern, action, arg in self._compiled_patterns:
-            match = pattern.match(text)
-            if match:
-                # Handle dynamic argument from regex match
-                actual_arg = arg
-                if arg == "match" and match.groups():
-                    actual_arg = int(match.group(1))
-
-                # Get remaining text after command
-                remaining = text[match.end():].strip()
-                return (action, actual_arg), remaining
-
-        return None, text
-
-    def execute_command(self, command: tuple[str, any], typer: "TextTyper") -> bool:
+        # Most transcriptions have nothing to strip, so skip the copy
+        stripped = text
+        if text[:1].isspace() or text[-1:].isspace():
+            stripped = text.strip()
+        if len(stripped) > MAX_COMMAND_LENGTH:
+            return None, text
+
+        # Lowercase once for both the prefilter and the match
+        key = stripped.lower()
+        if not key.startswith(COMMAND_PREFIXES):
+            return None, text
+
+        command = _match_command(key)
+        if command is None:
+            return None, text
+        return command, ""
+
+    def execute_command(self, command: tuple[str, Any], typer: "TextTyper") -> bool:
         """Execute a voice command.
 
         Args:
@@ -83,53 +187,15 @@ class VoiceCommandProcessor:
         Returns:
             True if command was executed successfully
         """
-        action, arg = command
-
-        if action == "delete_last":
-            # Delete the last typed text
-            if self._last_typed_length > 0:
-                typer.delete_chars(self._last_typed_length)
-                self._last_typed_length = 0
-            return True
-
-        elif action == "delete_words":
-            count = arg if arg else 1
-            typer.delete_words(count)
-            return True
-
-        elif action == "backspace":
-            count = arg if arg else 1
-            typer.delete_chars(count)
-            return True
-
-        elif action == "undo":
-            typer.undo()
-            return True
-
-        elif action == "newline":
-            count = arg if arg else 1
-            for _ in range(count):
-                typer.press_enter()
-            return True
-
-        elif action == "tab":
-            typer.press_tab()
-            return True
-
-        elif action == "select_all":
-            typer.select_all()
-            return True
-
-        elif action == "copy":
-            typer.copy()
-            return True
-
-        elif action == "paste":
-            typer.paste()
-            return True
-
-        elif action == "cut":
-            typer.cut()
-            return True
-
-        return False
+        handler = self._dispatch.get(command[0])
+        if handler is None:
+            return False
+
+        handler(self, typer, command[1])
+        return True
+
+    def _delete_last(self, typer: "TextTyper") -> None:
+        """Delete the last typed text."""
+        if self._last_typed_length > 0:
+            typer.delete_chars(self._last_typed_length)
+            self._last_typed_length = 0